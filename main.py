@@ -260,6 +260,9 @@ class PlaywrightTestCLI:
                 import traceback
                 traceback.print_exc()
             raise
+        finally:
+            # Close the shared aiohttp session before asyncio.run() tears down the loop
+            await self.orchestrator.aclose()
     
     def _print_summary(self, results: List, use_browserforge: bool = False) -> None:
         """Print test results summary"""
@@ -446,6 +446,14 @@ class StealthTestOrchestrator:
         
         return all_results
     
+    async def aclose(self):
+        """Close async resources held by the enhanced runners created so far"""
+        for runner in self.enhanced_runners.values():
+            try:
+                await runner.aclose()
+            except Exception as e:
+                logger.warning(f"Could not close runner resources: {e}")
+    
     def save_results(
         self,
         results: List[TestResult],
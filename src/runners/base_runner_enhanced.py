@@ -64,6 +64,10 @@ class BaseRunner:
             self._resolved_proxy = None  # Clear cached proxy
             logger.info("✅ Session ended")
     
+    async def aclose(self):
+        """Release async resources (shared HTTP session, resolution cache DB) inside the running loop"""
+        await self.ip_resolver.aclose()
+    
     async def resolve_proxy_before_launch(
         self,
         proxy_config: Dict[str, str]
@@ -5,6 +5,7 @@ BALANCED FIX: Allows WebRTC but injects proxy IP instead of blocking completely
 """
 
 import logging
+import re
 from typing import Dict, Any, Optional
 from pathlib import Path
 
@@ -23,6 +24,9 @@ from .device_profile_loader import DeviceProfileLoader
 
 logger = logging.getLogger(__name__)
 
+# Device types routed to Android profiles (everything else is treated as iOS)
+_ANDROID_DEVICE_RE = re.compile(r'samsung|android|pixel|galaxy', re.IGNORECASE)
+
 
 class BrowserForgeManager:
     """
@@ -42,22 +46,29 @@ class BrowserForgeManager:
             logger.warning("⚠️ BrowserForge not available - using basic profiles only")
         
         # Session management
-        self._session_device = None
         self._session_config = None
         self._session_device_type = None
         self._session_fingerprint = None
+        self._session_screen = None
+        self._session_browsers = None
+        self._session_oses = None
     
     def start_new_session(self, device_type: str = "iphone_x"):
         """Start a new session with a consistent device"""
-        if "samsung" in device_type.lower() or "android" in device_type.lower():
+        if _ANDROID_DEVICE_RE.search(device_type):
             csv_profile = self.profile_loader.get_random_android_profile()
         else:
             csv_profile = self.profile_loader.get_random_iphone_profile()
         
-        self._session_device = csv_profile
         self._session_device_type = device_type
         self._session_config = self.profile_loader.convert_to_mobile_config(csv_profile)
         
+        # Device (and therefore viewport) is locked for the session, so the
+        # BrowserForge generation constraints only need to be built once
+        self._session_browsers, self._session_oses = self._get_browser_targets(device_type)
+        if BROWSERFORGE_AVAILABLE:
+            self._session_screen = self._build_screen(self._session_config['viewport'])
+        
         device_name = self._session_config.get('device_name', 'Unknown')
         logger.info(f"🔒 Session device locked: {device_name}")
         
@@ -77,10 +88,12 @@ class BrowserForgeManager:
             device_name = self._session_config.get('device_name', 'Unknown')
             logger.info(f"🔓 Session ended for: {device_name}")
         
-        self._session_device = None
         self._session_config = None
         self._session_device_type = None
         self._session_fingerprint = None
+        self._session_screen = None
+        self._session_browsers = None
+        self._session_oses = None
     
     def generate_enhanced_fingerprint(
         self,
@@ -131,22 +144,14 @@ class BrowserForgeManager:
     ) -> Dict[str, Any]:
         """Apply BrowserForge fingerprint with pre-resolved timezone"""
         
-        if "android" in device_type.lower() or "samsung" in device_type.lower():
-            browsers = ['chrome']
-            operating_systems = ['android']
+        # Reuse the per-session constraints built in start_new_session()
+        if self._session_browsers is not None:
+            browsers = self._session_browsers
+            operating_systems = self._session_oses
         else:
-            browsers = ['safari']
-            operating_systems = ['ios']
+            browsers, operating_systems = self._get_browser_targets(device_type)
         
-        viewport_width = base_config['viewport']['width']
-        viewport_height = base_config['viewport']['height']
-        
-        screen = Screen(
-            min_width=viewport_width - 10,
-            max_width=viewport_width + 10,
-            min_height=viewport_height - 10,
-            max_height=viewport_height + 10
-        )
+        screen = self._session_screen or self._build_screen(base_config['viewport'])
         
         fingerprint = self.fp_generator.generate(
             screen=screen,
@@ -191,6 +196,23 @@ class BrowserForgeManager:
         
         return enhanced_config
     
+    @staticmethod
+    def _get_browser_targets(device_type: str):
+        """Get BrowserForge (browsers, operating_systems) for a device type"""
+        if _ANDROID_DEVICE_RE.search(device_type):
+            return ['chrome'], ['android']
+        return ['safari'], ['ios']
+    
+    @staticmethod
+    def _build_screen(viewport: Dict[str, int]):
+        """Build BrowserForge screen constraints around a viewport"""
+        return Screen(
+            min_width=viewport['width'] - 10,
+            max_width=viewport['width'] + 10,
+            min_height=viewport['height'] - 10,
+            max_height=viewport['height'] + 10
+        )
+    
     def get_browserforge_injection_script(
         self, 
         enhanced_config: Dict[str, Any]
@@ -1,14 +1,19 @@
 # src/utils/config_loader.py
 
 import os
+import copy
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 def load_device_profile(device_name):
     """
     Loads a device profile JSON from the config directory.
     
+    Profiles are parsed once per process; each call returns a fresh copy so
+    callers may mutate the result without affecting the cache.
+    
     Args:
         device_name (str): The name of the device profile to load (e.g., 'iphone_x').
 
@@ -16,12 +21,11 @@ def load_device_profile(device_name):
         dict: The loaded device profile, or None if an error occurs.
     """
     logger = logging.getLogger(__name__)
-    config_path = Path(__file__).parent.parent / "config" / "devices" / f"{device_name}.json"
+    config_path = _device_profile_path(device_name)
     
     logger.debug(f"Attempting to load device profile from: {config_path}")
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return copy.deepcopy(_read_device_profile(config_path))
     except FileNotFoundError:
         logger.error(f"Device profile not found: {config_path}")
         return None
@@ -29,6 +33,20 @@ def load_device_profile(device_name):
         logger.error(f"Error decoding device profile JSON '{config_path}': {e}")
         return None
 
+def _device_profile_path(device_name):
+    """Path of the JSON file for a device profile."""
+    return Path(__file__).parent.parent / "config" / "devices" / f"{device_name}.json"
+
+@lru_cache(maxsize=None)
+def _read_device_profile(config_path):
+    """
+    Read and parse a device profile JSON (cached per path).
+    
+    Errors propagate so that failed reads are not cached.
+    """
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
 def get_proxy_config(proxy_arg):
     """
     Parses the proxy argument from the CLI or environment variables.
@@ -3,13 +3,47 @@ Device Profile Loader
 Loads and manages device profiles from CSV files for realistic mobile emulation
 """
 
+import json
 import logging
 import random
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Packaged fallback profiles, used when no CSV profiles are available
+DEFAULT_PROFILES_DIR = Path(__file__).with_name("data")
+
+
+@lru_cache(maxsize=None)
+def _load_default_profiles(filename: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Load packaged default profiles from the data directory
+    
+    Read once per process and shared by all loaders. Languages are pre-split
+    here so later passes find nothing to change; profiles are read-only
+    downstream (convert_to_mobile_config copies what it hands out).
+    """
+    with open(DEFAULT_PROFILES_DIR / filename, 'r') as f:
+        return tuple(_presplit_languages(json.load(f)))
+
+
+def _presplit_languages(profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Split comma-separated 'languages' values once at load time
+    
+    Profiles with identical language strings share the same list.
+    """
+    split_cache: Dict[str, List[str]] = {}
+    for profile in profiles:
+        languages = profile.get('languages', 'en-US,en')
+        if isinstance(languages, str):
+            if languages not in split_cache:
+                split_cache[languages] = [lang.strip() for lang in languages.split(',')]
+            profile['languages'] = split_cache[languages]
+    return profiles
+
 
 class DeviceProfileLoader:
     """
@@ -25,8 +59,8 @@ class DeviceProfileLoader:
             profiles_dir: Path to profiles directory (optional)
         """
         self.profiles_dir = profiles_dir
-        self.iphone_profiles = self._load_iphone_profiles()
-        self.android_profiles = self._load_android_profiles()
+        self.iphone_profiles = _presplit_languages(self._load_iphone_profiles())
+        self.android_profiles = _presplit_languages(self._load_android_profiles())
         
         logger.info(f"Loaded {len(self.iphone_profiles)} iPhone profiles")
         logger.info(f"Loaded {len(self.android_profiles)} Android profiles")
@@ -49,84 +83,7 @@ class DeviceProfileLoader:
                     logger.warning(f"Failed to load iPhone CSV: {e}")
         
         # Fallback to default iPhone profiles
-        return [
-            {
-                'device_name': 'iPhone 12 Pro',
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1',
-                'viewport_width': '390',
-                'viewport_height': '844',
-                'device_scale_factor': '3',
-                'platform': 'iPhone',
-                'max_touch_points': '5',
-                'hardware_concurrency': '6',
-                'device_memory': '4',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Los_Angeles',
-                'webgl_vendor': 'Apple Inc.',
-                'webgl_renderer': 'Apple GPU',
-                'os_version': '14.6',
-                'battery_level': '0.85',
-                'battery_charging': 'false'
-            },
-            {
-                'device_name': 'iPhone 13 Pro Max',
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1',
-                'viewport_width': '428',
-                'viewport_height': '926',
-                'device_scale_factor': '3',
-                'platform': 'iPhone',
-                'max_touch_points': '5',
-                'hardware_concurrency': '6',
-                'device_memory': '6',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Los_Angeles',
-                'webgl_vendor': 'Apple Inc.',
-                'webgl_renderer': 'Apple GPU',
-                'os_version': '15.0',
-                'battery_level': '0.72',
-                'battery_charging': 'true'
-            },
-            {
-                'device_name': 'iPhone 14',
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1',
-                'viewport_width': '390',
-                'viewport_height': '844',
-                'device_scale_factor': '3',
-                'platform': 'iPhone',
-                'max_touch_points': '5',
-                'hardware_concurrency': '6',
-                'device_memory': '6',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Los_Angeles',
-                'webgl_vendor': 'Apple Inc.',
-                'webgl_renderer': 'Apple GPU',
-                'os_version': '16.0',
-                'battery_level': '0.65',
-                'battery_charging': 'false'
-            },
-            {
-                'device_name': 'iPhone 15 Pro',
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
-                'viewport_width': '393',
-                'viewport_height': '852',
-                'device_scale_factor': '3',
-                'platform': 'iPhone',
-                'max_touch_points': '5',
-                'hardware_concurrency': '6',
-                'device_memory': '8',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Chicago',
-                'webgl_vendor': 'Apple Inc.',
-                'webgl_renderer': 'Apple A17 Pro GPU',
-                'os_version': '17.0',
-                'battery_level': '0.91',
-                'battery_charging': 'true'
-            }
-        ]
+        return list(_load_default_profiles("default_iphone_profiles.json"))
     
     def _load_android_profiles(self) -> List[Dict[str, Any]]:
         """Load Android profiles (from CSV or use defaults)"""
@@ -146,84 +103,7 @@ class DeviceProfileLoader:
                     logger.warning(f"Failed to load Android CSV: {e}")
         
         # Fallback to default Android profiles
-        return [
-            {
-                'device_name': 'Samsung Galaxy S21',
-                'user_agent': 'Mozilla/5.0 (Linux; Android 11; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.120 Mobile Safari/537.36',
-                'viewport_width': '360',
-                'viewport_height': '800',
-                'device_scale_factor': '3',
-                'platform': 'Linux armv8l',
-                'max_touch_points': '5',
-                'hardware_concurrency': '8',
-                'device_memory': '8',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Los_Angeles',
-                'webgl_vendor': 'Qualcomm',
-                'webgl_renderer': 'Adreno (TM) 660',
-                'os_version': '11',
-                'battery_level': '0.78',
-                'battery_charging': 'false'
-            },
-            {
-                'device_name': 'Samsung Galaxy S22',
-                'user_agent': 'Mozilla/5.0 (Linux; Android 12; SM-S906B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Mobile Safari/537.36',
-                'viewport_width': '360',
-                'viewport_height': '780',
-                'device_scale_factor': '3',
-                'platform': 'Linux armv8l',
-                'max_touch_points': '5',
-                'hardware_concurrency': '8',
-                'device_memory': '8',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Los_Angeles',
-                'webgl_vendor': 'Qualcomm',
-                'webgl_renderer': 'Adreno (TM) 730',
-                'os_version': '12',
-                'battery_level': '0.82',
-                'battery_charging': 'true'
-            },
-            {
-                'device_name': 'Google Pixel 6',
-                'user_agent': 'Mozilla/5.0 (Linux; Android 12; Pixel 6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.104 Mobile Safari/537.36',
-                'viewport_width': '412',
-                'viewport_height': '915',
-                'device_scale_factor': '2.625',
-                'platform': 'Linux armv8l',
-                'max_touch_points': '5',
-                'hardware_concurrency': '8',
-                'device_memory': '8',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Denver',
-                'webgl_vendor': 'ARM',
-                'webgl_renderer': 'Mali-G78',
-                'os_version': '12',
-                'battery_level': '0.69',
-                'battery_charging': 'false'
-            },
-            {
-                'device_name': 'Google Pixel 7 Pro',
-                'user_agent': 'Mozilla/5.0 (Linux; Android 13; Pixel 7 Pro) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Mobile Safari/537.36',
-                'viewport_width': '412',
-                'viewport_height': '892',
-                'device_scale_factor': '3.5',
-                'platform': 'Linux armv8l',
-                'max_touch_points': '5',
-                'hardware_concurrency': '8',
-                'device_memory': '12',
-                'language': 'en-US',
-                'languages': 'en-US,en',
-                'timezone': 'America/Phoenix',
-                'webgl_vendor': 'ARM',
-                'webgl_renderer': 'Mali-G710',
-                'os_version': '13',
-                'battery_level': '0.88',
-                'battery_charging': 'true'
-            }
-        ]
+        return list(_load_default_profiles("default_android_profiles.json"))
     
     def get_random_iphone_profile(self) -> Dict[str, Any]:
         """Get a random iPhone profile"""
@@ -251,12 +131,10 @@ class DeviceProfileLoader:
         Returns:
             mobile_config dictionary
         """
-        # Parse languages
-        languages_str = csv_profile.get('languages', 'en-US,en')
-        if isinstance(languages_str, str):
-            languages = [lang.strip() for lang in languages_str.split(',')]
-        else:
-            languages = languages_str
+        # Languages are pre-split at load time; split here for profiles that bypassed the loader
+        languages = csv_profile.get('languages', ['en-US', 'en'])
+        if isinstance(languages, str):
+            languages = [lang.strip() for lang in languages.split(',')]
         
         # Parse viewport
         viewport_width = int(csv_profile.get('viewport_width', 390))
@@ -305,7 +183,7 @@ class DeviceProfileLoader:
             'hardware_concurrency': hardware_concurrency,
             'device_memory': device_memory,
             'language': csv_profile.get('language', 'en-US'),
-            'languages': languages,
+            'languages': list(languages),
             'timezone': csv_profile.get('timezone', 'America/Los_Angeles'),
             'webgl_vendor': csv_profile.get('webgl_vendor', 'Apple Inc.'),
             'webgl_renderer': csv_profile.get('webgl_renderer', 'Apple GPU'),
@@ -2,75 +2,43 @@
 Enhanced Fingerprint Injector with Comprehensive Device Spoofing
 """
 
-def generate_fingerprint_script(profile: dict) -> str:
-    """Generate comprehensive JavaScript to inject device fingerprint"""
-    
-    # Get values with defaults
-    hardware_concurrency = profile.get('hardware_concurrency', 4)
-    device_memory = profile.get('device_memory', 4)
-    max_touch_points = profile.get('max_touch_points', 5)
-    platform = profile.get('platform', 'iPhone')
-    webgl_vendor = profile.get('webgl_vendor', 'Apple Inc.')
-    webgl_renderer = profile.get('webgl_renderer', 'Apple GPU')
-    language = profile.get('language', 'en-US').replace('_', '-')
-    languages = f"['{language}', 'en']"
-    timezone = profile.get('timezone', 'America/New_York')
-    battery_level = profile.get('battery_level', 50) / 100.0
-    battery_charging = str(profile.get('battery_charging', False)).lower()
-    
-    return f"""
+import json
+import re
+from functools import lru_cache
+from operator import itemgetter
+from string import Formatter
+
+# JavaScript skeleton, parsed once at import; placeholders are filled by str.format
+_FP_TEMPLATE = """
     (function() {{
         'use strict';
         
-        // Override hardware concurrency
-        Object.defineProperty(navigator, 'hardwareConcurrency', {{
-            get: () => {hardware_concurrency}
-        }});
-        
-        // Override device memory
-        Object.defineProperty(navigator, 'deviceMemory', {{
-            get: () => {device_memory}
-        }});
-        
-        // Override max touch points
-        Object.defineProperty(navigator, 'maxTouchPoints', {{
-            get: () => {max_touch_points}
+        // Override navigator properties in one batch
+        Object.defineProperties(navigator, {{
+            hardwareConcurrency: {{ get: () => {hardware_concurrency} }},
+            deviceMemory: {{ get: () => {device_memory} }},
+            maxTouchPoints: {{ get: () => {max_touch_points} }},
+            platform: {{ get: () => {platform_js} }},
+            language: {{ get: () => {language_js} }},
+            languages: {{ get: () => {languages_js} }}
         }});
         
-        // Override platform
-        Object.defineProperty(navigator, 'platform', {{
-            get: () => '{platform}'
+        // Override WebGL vendor/renderer (WebGL1 and WebGL2 share one wrapper)
+        const webglParams = Object.assign(Object.create(null), {{
+            37445: {webgl_vendor_js},
+            37446: {webgl_renderer_js},
+            7936: {webgl_vendor_js},
+            7937: {webgl_renderer_js}
         }});
-        
-        // Override languages
-        Object.defineProperty(navigator, 'language', {{
-            get: () => '{language}'
-        }});
-        
-        Object.defineProperty(navigator, 'languages', {{
-            get: () => {languages}
-        }});
-        
-        // Override WebGL vendor/renderer
-        const getParameter = WebGLRenderingContext.prototype.getParameter;
-        WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-            if (parameter === 37445) return '{webgl_vendor}';
-            if (parameter === 37446) return '{webgl_renderer}';
-            if (parameter === 7936) return '{webgl_vendor}';
-            if (parameter === 7937) return '{webgl_renderer}';
-            return getParameter.call(this, parameter);
+        const wrapGetParameter = (proto) => {{
+            const getParameter = proto.getParameter;
+            proto.getParameter = function(parameter) {{
+                return parameter in webglParams ? webglParams[parameter] : getParameter.call(this, parameter);
+            }};
         }};
-        
-        // Apply to WebGL2 as well
+        wrapGetParameter(WebGLRenderingContext.prototype);
         if (typeof WebGL2RenderingContext !== 'undefined') {{
-            const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-            WebGL2RenderingContext.prototype.getParameter = function(parameter) {{
-                if (parameter === 37445) return '{webgl_vendor}';
-                if (parameter === 37446) return '{webgl_renderer}';
-                if (parameter === 7936) return '{webgl_vendor}';
-                if (parameter === 7937) return '{webgl_renderer}';
-                return getParameter2.call(this, parameter);
-            }};
+            wrapGetParameter(WebGL2RenderingContext.prototype);
         }}
         
         // Override battery API
@@ -92,7 +60,7 @@ def generate_fingerprint_script(profile: dict) -> str:
         Intl.DateTimeFormat = function(...args) {{
             const options = args[1] || {{}};
             if (!options.timeZone) {{
-                options.timeZone = '{timezone}';
+                options.timeZone = {timezone_js};
                 args[1] = options;
             }}
             return new DateTimeFormat(...args);
@@ -122,3 +90,84 @@ def generate_fingerprint_script(profile: dict) -> str:
         console.log('Enhanced device fingerprint injected');
     }})();
     """
+
+
+def _minify_js(source: str) -> str:
+    """Strip line comments and collapse whitespace (template has no '//' in strings)"""
+    source = re.sub(r'//[^\n]*', '', source)
+    return re.sub(r'\s+', ' ', source).strip()
+
+
+def _to_positional(template: str, fields: tuple) -> str:
+    """Rewrite named {field} placeholders as positional {N} ones"""
+    index = {name: i for i, name in enumerate(fields)}
+    parts = []
+    for literal, field_name, _, _ in Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field_name is not None:
+            parts.append('{%d}' % index[field_name])
+    return ''.join(parts)
+
+
+# Template placeholders, in the positional order used by _render_fingerprint_script
+_TEMPLATE_FIELDS = (
+    'hardware_concurrency', 'device_memory', 'max_touch_points',
+    'platform_js', 'webgl_vendor_js', 'webgl_renderer_js',
+    'language_js', 'languages_js', 'timezone_js',
+    'battery_level', 'battery_charging',
+)
+
+# Minified and compiled to positional placeholders once at import, to shrink
+# the payload sent with every init script and skip per-field name lookups
+_FP_TEMPLATE_MIN = _to_positional(_minify_js(_FP_TEMPLATE), _TEMPLATE_FIELDS)
+
+
+# Profile defaults, in the positional order expected by _render_fingerprint_script
+_PROFILE_DEFAULTS = {
+    'hardware_concurrency': 4,
+    'device_memory': 4,
+    'max_touch_points': 5,
+    'platform': 'iPhone',
+    'webgl_vendor': 'Apple Inc.',
+    'webgl_renderer': 'Apple GPU',
+    'language': 'en-US',
+    'timezone': 'America/New_York',
+    'battery_level': 50,
+    'battery_charging': False,
+}
+_get_profile_fields = itemgetter(*_PROFILE_DEFAULTS)
+
+
+def generate_fingerprint_script(profile: dict) -> str:
+    """Generate comprehensive JavaScript to inject device fingerprint"""
+    
+    # Merge over defaults once instead of a .get() per field
+    values = {**_PROFILE_DEFAULTS, **profile}
+    values['language'] = values['language'].replace('_', '-')
+    values['battery_level'] = values['battery_level'] / 100.0
+    values['battery_charging'] = str(values['battery_charging']).lower()
+    
+    return _render_fingerprint_script(*_get_profile_fields(values))
+
+
+@lru_cache(maxsize=256)
+def _render_fingerprint_script(
+    hardware_concurrency, device_memory, max_touch_points, platform,
+    webgl_vendor, webgl_renderer, language, timezone,
+    battery_level, battery_charging
+) -> str:
+    """Render the fingerprint template (cached per distinct profile values)"""
+    # String values are encoded as proper JS literals (quotes/escaping included)
+    return _FP_TEMPLATE_MIN.format(
+        hardware_concurrency,
+        device_memory,
+        max_touch_points,
+        json.dumps(platform),
+        json.dumps(webgl_vendor),
+        json.dumps(webgl_renderer),
+        json.dumps(language),
+        json.dumps([language, 'en']),
+        json.dumps(timezone),
+        battery_level,
+        battery_charging
+    )
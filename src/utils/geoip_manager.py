@@ -4,22 +4,64 @@ GeoIP Manager - Robust offline/online GeoIP database management
 Handles GeoIP database initialization, auto-download, and fallback strategies
 """
 
+import asyncio
+import ipaddress
 import logging
+import mmap
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
-import urllib.request
-import shutil
+from typing import Optional, Dict, Any, Iterable
 
 logger = logging.getLogger(__name__)
 
+# Read size for streamed database downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+BYTES_PER_MB = 1048576
+
+# Download progress is logged once per this many bytes
+PROGRESS_LOG_INTERVAL = 4 * BYTES_PER_MB
+
+# Per-instance lookup cache size (negative results are cached too)
+LOOKUP_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=None)
+def _scan_existing_paths(search_paths: tuple) -> tuple:
+    """
+    Find which database search paths exist (scanned once per process)
+    
+    Returns:
+        Tuple of (path, stat_result) for each existing path, in priority order
+    """
+    found = []
+    for path in search_paths:
+        try:
+            path_stat = os.stat(os.fspath(path))
+        except OSError:
+            continue
+        found.append((path, path_stat))
+    return tuple(found)
+
 
 class GeoIPManager:
     """
     Manages GeoIP database with automatic download and fallback support
+    
+    GeoLite2 (.mmdb, read via maxminddb) is preferred; the legacy GeoLite
+    City (.dat, read via pygeoip) is kept as a fallback.
     """
     
     # GeoIP database sources (in priority order)
     GEOIP_SOURCES = [
+        {
+            'name': 'GeoLite2 City',
+            'url': 'https://github.com/P3TERX/GeoLite.mmdb/raw/download/GeoLite2-City.mmdb',
+            'filename': 'GeoLite2-City.mmdb',
+            'format': 'mmdb'
+        },
         {
             'name': 'GeoLite Legacy',
             'url': 'https://github.com/mbcc2006/GeoLiteCity-data/raw/master/GeoLiteCity.dat',
@@ -28,26 +70,46 @@ class GeoIPManager:
         },
     ]
     
-    # Search paths for existing database
-    SEARCH_PATHS = [
+    # Search paths for existing GeoLite2 database
+    MMDB_SEARCH_PATHS = (
+        Path(__file__).parent.parent.parent / "profiles" / "GeoLite2-City.mmdb",
+        Path.home() / ".playwright-stealth" / "GeoLite2-City.mmdb",
+        Path("/usr/share/GeoIP/GeoLite2-City.mmdb"),
+        Path("/usr/local/share/GeoIP/GeoLite2-City.mmdb"),
+        Path("./profiles/GeoLite2-City.mmdb"),
+        Path("./GeoLite2-City.mmdb"),
+    )
+    
+    # Search paths for existing legacy database
+    SEARCH_PATHS = (
         Path(__file__).parent.parent.parent / "profiles" / "GeoLiteCity.dat",
         Path.home() / ".playwright-stealth" / "GeoLiteCity.dat",
         Path("/usr/share/GeoIP/GeoLiteCity.dat"),
         Path("/usr/local/share/GeoIP/GeoLiteCity.dat"),
         Path("./profiles/GeoLiteCity.dat"),
         Path("./GeoLiteCity.dat"),
-    ]
+    )
     
-    def __init__(self, auto_download: bool = True):
+    def __init__(self, auto_download: bool = True, cache_mode: Optional[int] = None):
         """
         Initialize GeoIP manager
         
         Args:
             auto_download: Automatically download database if not found
+            cache_mode: pygeoip cache flag for legacy databases (default:
+                MMAP_CACHE, so the OS page cache is shared across processes;
+                pass pygeoip.MEMORY_CACHE for faster lookups in a single
+                process with RAM to spare)
         """
         self.geoip_db = None
         self.geoip_path = None
+        self._stat = None
+        self.db_format = None
+        self.maxminddb = None
+        self.pygeoip = None
         self.auto_download = auto_download
+        self.cache_mode = cache_mode
+        self._cached_lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup_ip_uncached)
         
         # Try to initialize
         self._initialize_geoip()
@@ -55,32 +117,37 @@ class GeoIPManager:
     def _initialize_geoip(self):
         """Initialize GeoIP database with fallback strategies"""
         
-        # Try to import pygeoip
+        # Try to import readers (maxminddb preferred, pygeoip for legacy)
+        try:
+            import maxminddb
+            self.maxminddb = maxminddb
+        except ImportError:
+            logger.debug("maxminddb not installed - GeoLite2 databases unavailable")
+        
         try:
             import pygeoip
             self.pygeoip = pygeoip
+            if self.cache_mode is None:
+                self.cache_mode = getattr(pygeoip, 'MMAP_CACHE', pygeoip.MEMORY_CACHE)
         except ImportError:
-            logger.warning("⚠️ pygeoip not installed. Install with: pip install pygeoip")
+            logger.debug("pygeoip not installed - legacy databases unavailable")
+        
+        if not self.maxminddb and not self.pygeoip:
+            logger.warning("⚠️ No GeoIP reader installed. Install with: pip install maxminddb")
             logger.info("💡 Will use online fallback for IP geolocation")
             return
         
         # Search for existing database
-        for path in self.SEARCH_PATHS:
-            if path.exists():
-                try:
-                    self.geoip_db = pygeoip.GeoIP(str(path), pygeoip.MEMORY_CACHE)
-                    self.geoip_path = path
-                    
-                    # Verify it works
-                    test_record = self.geoip_db.record_by_addr("8.8.8.8")
-                    if test_record:
-                        logger.info(f"✅ GeoIP database loaded: {path}")
-                        logger.info(f"   Database size: {path.stat().st_size / 1024 / 1024:.1f} MB")
-                        return
-                
-                except Exception as e:
-                    logger.debug(f"Failed to load GeoIP from {path}: {e}")
-                    continue
+        search_order = (('mmdb', self.MMDB_SEARCH_PATHS), ('legacy', self.SEARCH_PATHS))
+        for db_format, search_paths in search_order:
+            if not self._reader_available(db_format):
+                continue
+            
+            for path, path_stat in _scan_existing_paths(tuple(search_paths)):
+                if self._open_database(path, db_format, path_stat):
+                    logger.info(f"✅ GeoIP database loaded: {path}")
+                    logger.info(f"   Database size: {path_stat.st_size / BYTES_PER_MB:.1f} MB")
+                    return
         
         # Database not found
         logger.warning("⚠️ GeoIP database not found in any search path")
@@ -95,6 +162,87 @@ class GeoIPManager:
         else:
             logger.info("💡 Auto-download disabled - will use online fallback")
     
+    def _reader_available(self, db_format: str) -> bool:
+        """Check if a reader library for the database format is installed"""
+        if db_format == 'mmdb':
+            return self.maxminddb is not None
+        return self.pygeoip is not None
+    
+    def _open_database(
+        self,
+        path: Path,
+        db_format: str,
+        path_stat: Optional[os.stat_result] = None
+    ) -> bool:
+        """
+        Open and verify a database file, making it the active database
+        
+        Args:
+            path: Database file path
+            db_format: 'mmdb' or 'legacy'
+            path_stat: Already-known stat() of the file (fetched if omitted)
+        
+        Returns:
+            True if the database opened and answered a test lookup
+        """
+        try:
+            if db_format == 'mmdb':
+                db = self._open_mmdb(path)
+                test_record = db.get("8.8.8.8")
+            else:
+                db = self.pygeoip.GeoIP(str(path), self.cache_mode)
+                test_record = db.record_by_addr("8.8.8.8")
+        except Exception as e:
+            logger.debug(f"Failed to load GeoIP from {path}: {e}")
+            return False
+        
+        if not test_record:
+            logger.debug(f"GeoIP database at {path} returned no test record")
+            return False
+        
+        self.geoip_db = db
+        self.geoip_path = path
+        self._stat = path_stat or self._stat_or_none(path)
+        self.db_format = db_format
+        self._cached_lookup.cache_clear()
+        self._advise_access_pattern(db, path)
+        return True
+    
+    def _open_mmdb(self, path: Path):
+        """
+        Open an MMDB with the libmaxminddb C extension, falling back to the
+        pure-Python mmap reader when the extension is not built
+        
+        Both map the file read-only and shared, so worker processes share
+        one copy of it in the page cache.
+        """
+        try:
+            return self.maxminddb.open_database(str(path), self.maxminddb.MODE_MMAP_EXT)
+        except ValueError:
+            logger.debug("maxminddb C extension unavailable - using MODE_MMAP")
+            return self.maxminddb.open_database(str(path), self.maxminddb.MODE_MMAP)
+    
+    @staticmethod
+    def _advise_access_pattern(db, path: Path):
+        """
+        Tell the kernel a fallback reader's mapping is read randomly (best effort, Linux)
+        
+        Lookups are small random reads across the file, so readahead on the
+        mapping is wasted I/O. This only covers the fallback readers: the
+        pure-Python maxminddb reader (MODE_MMAP) and pygeoip MMAP_CACHE,
+        found through their private mmap attributes. The default C extension
+        reader (MODE_MMAP_EXT) does not expose its mapping and is left alone.
+        An fadvise on a separately opened descriptor would not reach any
+        reader's mapping either.
+        """
+        # Private attributes: pure-Python maxminddb (_buffer), pygeoip MMAP_CACHE (_fp)
+        buffer = getattr(db, '_buffer', None) or getattr(db, '_fp', None)
+        if isinstance(buffer, mmap.mmap) and hasattr(mmap, 'MADV_RANDOM'):
+            try:
+                buffer.madvise(mmap.MADV_RANDOM)
+            except OSError as e:
+                logger.debug(f"madvise failed for {path}: {e}")
+    
     def _download_geoip_database(self) -> bool:
         """
         Download GeoIP database from available sources
@@ -102,12 +250,20 @@ class GeoIPManager:
         Returns:
             True if successful, False otherwise
         """
+        # Only needed when a download actually happens - keep them off import
+        import shutil
+        import urllib.request
+        
         # Create profiles directory if it doesn't exist
         profiles_dir = Path(__file__).parent.parent.parent / "profiles"
         profiles_dir.mkdir(parents=True, exist_ok=True)
         
         # Try each source
         for source in self.GEOIP_SOURCES:
+            if not self._reader_available(source['format']):
+                logger.debug(f"Skipping {source['name']}: no reader for '{source['format']}' format")
+                continue
+            
             try:
                 download_path = profiles_dir / source['filename']
                 temp_path = download_path.with_suffix('.tmp')
@@ -115,41 +271,34 @@ class GeoIPManager:
                 logger.info(f"📥 Downloading from: {source['name']}")
                 logger.info(f"   URL: {source['url']}")
                 
-                # Download with progress
-                def report_progress(block_num, block_size, total_size):
-                    if total_size > 0:
-                        percent = block_num * block_size / total_size * 100
-                        if block_num % 100 == 0:  # Log every 100 blocks
-                            logger.debug(f"   Progress: {percent:.1f}%")
-                
-                urllib.request.urlretrieve(
-                    source['url'],
-                    temp_path,
-                    reporthook=report_progress
-                )
+                # Stream to disk
+                bytes_so_far = 0
+                with urllib.request.urlopen(source['url'], timeout=30) as response, \
+                        open(temp_path, 'wb') as f:
+                    while True:
+                        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        
+                        previous = bytes_so_far
+                        bytes_so_far += len(chunk)
+                        if bytes_so_far // PROGRESS_LOG_INTERVAL != previous // PROGRESS_LOG_INTERVAL:
+                            logger.debug(f"   Progress: {bytes_so_far / BYTES_PER_MB:.0f} MB")
                 
                 # Verify download
                 if temp_path.exists() and temp_path.stat().st_size > 1000000:  # At least 1MB
                     # Move to final location
                     shutil.move(str(temp_path), str(download_path))
+                    _scan_existing_paths.cache_clear()
                     
                     # Try to initialize
-                    try:
-                        self.geoip_db = self.pygeoip.GeoIP(
-                            str(download_path),
-                            self.pygeoip.MEMORY_CACHE
-                        )
-                        self.geoip_path = download_path
-                        
-                        # Verify it works
-                        test_record = self.geoip_db.record_by_addr("8.8.8.8")
-                        if test_record:
-                            logger.info(f"✅ Downloaded and verified: {download_path}")
-                            return True
+                    if self._open_database(download_path, source['format']):
+                        logger.info(f"✅ Downloaded and verified: {download_path}")
+                        return True
                     
-                    except Exception as e:
-                        logger.error(f"❌ Downloaded file is corrupted: {e}")
-                        download_path.unlink(missing_ok=True)
+                    logger.error(f"❌ Downloaded file is corrupted: {download_path}")
+                    download_path.unlink(missing_ok=True)
                 else:
                     logger.error(f"❌ Download incomplete or corrupted")
                     temp_path.unlink(missing_ok=True)
@@ -160,21 +309,66 @@ class GeoIPManager:
         
         return False
     
+    @staticmethod
+    def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+        """stat() a path, returning None if it does not exist"""
+        try:
+            return path.stat()
+        except OSError:
+            return None
+    
     def lookup_ip(self, ip_address: str) -> Optional[Dict[str, Any]]:
         """
         Lookup IP address in GeoIP database
         
+        Thread-safe without extra locking: the readers support concurrent
+        lookups and the result cache is an lru_cache.
+        
         Args:
             ip_address: IP address to lookup
         
         Returns:
             Dict with city, country_code, country_name, region, etc.
-            or None if lookup fails
+            or None if lookup fails (shared cached result - do not mutate)
         """
-        if not self.geoip_db:
+        if self.geoip_db is None:
             return None
         
+        return self._cached_lookup(ip_address)
+    
+    async def lookup_ip_many(self, ip_addresses: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Lookup many IP addresses without blocking the event loop
+        
+        Lookups run in a worker thread; duplicates are looked up once.
+        
+        Args:
+            ip_addresses: IP addresses to lookup
+        
+        Returns:
+            Dict mapping each IP address to its lookup_ip() result
+        """
+        unique_ips = set(ip_addresses)
+        return await asyncio.to_thread(
+            lambda: {ip: self.lookup_ip(ip) for ip in unique_ips}
+        )
+    
+    def _lookup_ip_uncached(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Lookup IP address in GeoIP database, bypassing the cache"""
+        # Malformed and non-public addresses never resolve - skip the database
         try:
+            addr = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return None
+        if (addr.is_private or addr.is_loopback or addr.is_link_local
+                or addr.is_multicast or addr.is_reserved):
+            return None
+        
+        try:
+            if self.db_format == 'mmdb':
+                record = self.geoip_db.get(ip_address)
+                return self._normalize_mmdb_record(record) if record else None
+            
             record = self.geoip_db.record_by_addr(ip_address)
             if record:
                 return {
@@ -194,23 +388,45 @@ class GeoIPManager:
             logger.debug(f"GeoIP lookup failed for {ip_address}: {e}")
             return None
     
+    @staticmethod
+    def _normalize_mmdb_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GeoLite2 City record to the legacy lookup_ip() shape"""
+        city = record.get('city', {})
+        country = record.get('country', {})
+        location = record.get('location', {})
+        subdivisions = record.get('subdivisions') or [{}]
+        
+        return {
+            'city': city.get('names', {}).get('en', '').lower(),
+            'country_code': country.get('iso_code', ''),
+            'country_name': country.get('names', {}).get('en', ''),
+            'region': subdivisions[0].get('iso_code', ''),
+            'region_name': subdivisions[0].get('names', {}).get('en', ''),
+            'latitude': location.get('latitude'),
+            'longitude': location.get('longitude'),
+            'time_zone': location.get('time_zone'),
+            'metro_code': location.get('metro_code'),
+        }
+    
     def is_available(self) -> bool:
         """Check if GeoIP database is available and working"""
         return self.geoip_db is not None
     
     def get_database_info(self) -> Dict[str, Any]:
         """Get information about the loaded database"""
-        if not self.geoip_db or not self.geoip_path:
+        if self.geoip_db is None or not self.geoip_path:
             return {
                 'available': False,
                 'path': None,
+                'format': None,
                 'size_mb': 0
             }
         
         return {
             'available': True,
             'path': str(self.geoip_path),
-            'size_mb': self.geoip_path.stat().st_size / 1024 / 1024
+            'format': self.db_format,
+            'size_mb': self._stat.st_size / BYTES_PER_MB if self._stat else 0
         }
     
     @classmethod
@@ -235,14 +451,16 @@ class GeoIPManager:
 
 # Singleton instance
 _geoip_instance = None
+_geoip_lock = threading.Lock()
 
 
 def get_geoip_manager(auto_download: bool = True) -> GeoIPManager:
     """
-    Get singleton GeoIP manager instance
+    Get singleton GeoIP manager instance (thread-safe, first call wins)
     
     Args:
-        auto_download: Auto-download database if not found (first call only)
+        auto_download: Auto-download database if not found (first call only;
+            ignored once the instance exists)
     
     Returns:
         GeoIPManager instance
@@ -250,6 +468,8 @@ def get_geoip_manager(auto_download: bool = True) -> GeoIPManager:
     global _geoip_instance
     
     if _geoip_instance is None:
-        _geoip_instance = GeoIPManager(auto_download=auto_download)
+        with _geoip_lock:
+            if _geoip_instance is None:
+                _geoip_instance = GeoIPManager(auto_download=auto_download)
     
     return _geoip_instance
@@ -5,21 +5,182 @@ CRITICAL FIX: Ensures Geolocation API coordinates match the actual IP location
 by using timezone-based defaults when GeoIP coordinates are inaccurate
 """
 
+import atexit
+import ipaddress
+import json
 import logging
 import socket
+import sqlite3
 import asyncio
-from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, asdict
+from types import MappingProxyType
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import aiodns
+    AIODNS_AVAILABLE = True
+except ImportError:
+    aiodns = None
+    AIODNS_AVAILABLE = False
 
 from .timezone_manager import TimezoneManager
 from .geoip_manager import get_geoip_manager
 
 logger = logging.getLogger(__name__)
 
+# JSON parser for ip-api.com responses and persisted records (accepts bytes or str)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Online geolocation fallback
+IP_API_URL = "http://ip-api.com"
+IP_API_FIELDS = "status,timezone,city,country,countryCode,lat,lon,query"
+IP_API_BATCH_SIZE = 100  # Max queries per /batch request
+
+# Resolution cache: entries expire so rotating proxies pick up their new IP
+DNS_TTL = 300  # seconds
+RESOLUTION_CACHE_SIZE = 1024
+
+# Resolutions persisted across runs (warm start); expiries are wall-clock here
+RESOLUTION_DB_PATH = Path.home() / ".playwright-stealth" / "ip_resolver_cache.db"
+
+# 🆕 TIMEZONE DEFAULT COORDINATES (Major city centers)
+# Used when GeoIP coordinates are inaccurate or unavailable
+TIMEZONE_DEFAULT_COORDS = MappingProxyType({
+    'America/Los_Angeles': (34.0522, -118.2437),  # Los Angeles downtown
+    'America/New_York': (40.7128, -74.0060),      # New York City
+    'America/Chicago': (41.8781, -87.6298),       # Chicago downtown
+    'America/Denver': (39.7392, -104.9903),       # Denver downtown
+    'America/Phoenix': (33.4484, -112.0740),      # Phoenix downtown
+    'America/Toronto': (43.6532, -79.3832),       # Toronto
+    'America/Vancouver': (49.2827, -123.1207),    # Vancouver
+    'Europe/London': (51.5074, -0.1278),          # London
+    'Europe/Paris': (48.8566, 2.3522),            # Paris
+    'Europe/Berlin': (52.5200, 13.4050),          # Berlin
+    'Asia/Tokyo': (35.6762, 139.6503),            # Tokyo
+    'Asia/Singapore': (1.3521, 103.8198),         # Singapore
+    'Asia/Hong_Kong': (22.3193, 114.1694),        # Hong Kong
+})
+
+# US timezone by longitude band: _US_LON_TIMEZONES[i] covers the band west of _US_LON_BINS[i]
+_US_LON_BINS = (-120.0, -104.0, -87.0)
+_US_LON_TIMEZONES = (
+    'America/Los_Angeles',
+    'America/Denver',
+    'America/Chicago',
+    'America/New_York',
+)
+
+# 🆕 MAJOR CITIES COORDINATES (for city-based matching)
+# Keys are casefolded once here; look up with city.casefold()
+CITY_COORDS = MappingProxyType({city.casefold(): coords for city, coords in {
+    'los angeles': (34.0522, -118.2437),
+    'san francisco': (37.7749, -122.4194),
+    'san jose': (37.3382, -121.8863),
+    'seattle': (47.6062, -122.3321),
+    'new york': (40.7128, -74.0060),
+    'chicago': (41.8781, -87.6298),
+    'miami': (25.7617, -80.1918),
+    'dallas': (32.7767, -96.7970),
+    'denver': (39.7392, -104.9903),
+    'phoenix': (33.4484, -112.0740),
+    'boston': (42.3601, -71.0589),
+    'atlanta': (33.7490, -84.3880),
+    'london': (51.5074, -0.1278),
+    'paris': (48.8566, 2.3522),
+    'tokyo': (35.6762, 139.6503),
+    'singapore': (1.3521, 103.8198),
+}.items()})
+
+
+# aiohttp sessions and aiodns resolvers are bound to the loop that created
+# them, so they are shared per event loop by every IPResolver instance
+_http_sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+_dns_resolvers: Dict[asyncio.AbstractEventLoop, Any] = {}
+
+
+def _drop_closed_loops():
+    """Forget clients belonging to event loops that have been closed"""
+    for clients in (_http_sessions, _dns_resolvers):
+        for loop in [loop for loop in clients if loop.is_closed()]:
+            del clients[loop]
+
+
+def _shared_http_session():
+    """Get the running loop's HTTP session (keep-alive to ip-api.com), creating it on first use"""
+    if not AIOHTTP_AVAILABLE:
+        raise RuntimeError("aiohttp not installed. Install with: pip install aiohttp")
+    
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        _drop_closed_loops()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                resolver=aiohttp.ThreadedResolver(),
+                limit=32,
+                ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
+        _http_sessions[loop] = session
+    return session
+
+
+def _shared_dns_resolver():
+    """Get the running loop's aiodns resolver, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    resolver = _dns_resolvers.get(loop)
+    if resolver is None:
+        _drop_closed_loops()
+        resolver = aiodns.DNSResolver(loop=loop, timeout=2, tries=2)
+        _dns_resolvers[loop] = resolver
+    return resolver
+
+
+async def close_shared_clients():
+    """Close the running loop's shared HTTP session (call before the loop ends)"""
+    loop = asyncio.get_running_loop()
+    _dns_resolvers.pop(loop, None)
+    session = _http_sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
 
-@dataclass
+@atexit.register
+def _close_shared_clients_at_exit():
+    """Close sessions whose loop is still usable (e.g. run_until_complete callers)"""
+    for loop, session in list(_http_sessions.items()):
+        if not session.closed and not loop.is_closed() and not loop.is_running():
+            try:
+                loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.debug(f"Failed to close HTTP session at exit: {e}")
+    _http_sessions.clear()
+    _dns_resolvers.clear()
+
+
+@dataclass(slots=True, frozen=True)
 class ResolvedProxy:
-    """Container for resolved proxy information"""
+    """Container for resolved proxy information (immutable; shared by cache and callers)"""
     hostname: str
     ip_address: str
     timezone: str
@@ -37,49 +198,33 @@ class IPResolver:
     Resolves proxy hostnames to IPs and detects timezones with ACCURATE coordinates
     """
     
-    # 🆕 TIMEZONE DEFAULT COORDINATES (Major city centers)
-    # Used when GeoIP coordinates are inaccurate or unavailable
-    TIMEZONE_DEFAULT_COORDS = {
-        'America/Los_Angeles': (34.0522, -118.2437),  # Los Angeles downtown
-        'America/New_York': (40.7128, -74.0060),      # New York City
-        'America/Chicago': (41.8781, -87.6298),       # Chicago downtown
-        'America/Denver': (39.7392, -104.9903),       # Denver downtown
-        'America/Phoenix': (33.4484, -112.0740),      # Phoenix downtown
-        'America/Toronto': (43.6532, -79.3832),       # Toronto
-        'America/Vancouver': (49.2827, -123.1207),    # Vancouver
-        'Europe/London': (51.5074, -0.1278),          # London
-        'Europe/Paris': (48.8566, 2.3522),            # Paris
-        'Europe/Berlin': (52.5200, 13.4050),          # Berlin
-        'Asia/Tokyo': (35.6762, 139.6503),            # Tokyo
-        'Asia/Singapore': (1.3521, 103.8198),         # Singapore
-        'Asia/Hong_Kong': (22.3193, 114.1694),        # Hong Kong
-    }
-    
-    # 🆕 MAJOR CITIES COORDINATES (for city-based matching)
-    CITY_COORDS = {
-        'los angeles': (34.0522, -118.2437),
-        'san francisco': (37.7749, -122.4194),
-        'san jose': (37.3382, -121.8863),
-        'seattle': (47.6062, -122.3321),
-        'new york': (40.7128, -74.0060),
-        'chicago': (41.8781, -87.6298),
-        'miami': (25.7617, -80.1918),
-        'dallas': (32.7767, -96.7970),
-        'denver': (39.7392, -104.9903),
-        'phoenix': (33.4484, -112.0740),
-        'boston': (42.3601, -71.0589),
-        'atlanta': (33.7490, -84.3880),
-        'london': (51.5074, -0.1278),
-        'paris': (48.8566, 2.3522),
-        'tokyo': (35.6762, 139.6503),
-        'singapore': (1.3521, 103.8198),
-    }
-    
-    def __init__(self, timezone_manager: Optional[TimezoneManager] = None):
-        """Initialize IP resolver with accurate coordinate mapping"""
+    # Shared module-level maps (kept as class attributes for existing callers)
+    TIMEZONE_DEFAULT_COORDS = TIMEZONE_DEFAULT_COORDS
+    CITY_COORDS = CITY_COORDS
+    
+    def __init__(
+        self,
+        timezone_manager: Optional[TimezoneManager] = None,
+        cache_size: int = RESOLUTION_CACHE_SIZE,
+        cache_db_path: Optional[Path] = RESOLUTION_DB_PATH
+    ):
+        """
+        Initialize IP resolver with accurate coordinate mapping
+        
+        Args:
+            timezone_manager: TimezoneManager to use (created if omitted)
+            cache_size: Max hostnames kept in the in-memory cache
+            cache_db_path: SQLite file persisting resolutions (None to disable)
+        """
         self.timezone_manager = timezone_manager or TimezoneManager()
         self.geoip_manager = get_geoip_manager(auto_download=True)
-        self._resolution_cache: Dict[str, ResolvedProxy] = {}
+        # hostname -> (monotonic expiry, ResolvedProxy), least recently used first
+        self._resolution_cache: "OrderedDict[str, Tuple[float, ResolvedProxy]]" = OrderedDict()
+        self._cache_size = cache_size
+        # (hostname, force_refresh) -> pending resolution
+        self._in_flight: Dict[Tuple[str, bool], asyncio.Task] = {}
+        self._db = self._open_cache_db(cache_db_path) if cache_db_path else None
+        self._db_lock = threading.Lock()  # DB calls run on executor threads
         
         logger.info("🌐 IP Resolver initialized")
         
@@ -97,9 +242,6 @@ class IPResolver:
         """
         Resolve proxy hostname to IP and detect timezone with ACCURATE coordinates
         """
-        import time
-        start_time = time.time()
-        
         proxy_host = proxy_config.get("host", "")
         
         if not proxy_host:
@@ -111,25 +253,192 @@ class IPResolver:
                 resolution_method="no_proxy"
             )
         
-        # Check cache
-        if not force_refresh and proxy_host in self._resolution_cache:
-            cached = self._resolution_cache[proxy_host]
-            logger.debug(f"📋 Using cached resolution: {proxy_host} → {cached.ip_address} ({cached.timezone})")
+        # Check cache (hot path: no timing, log args formatted only if DEBUG is on)
+        cached = None if force_refresh else self._cache_get(proxy_host)
+        if cached is not None:
+            logger.debug("📋 Using cached resolution: %s → %s (%s)", proxy_host, cached.ip_address, cached.timezone)
             return cached
         
-        logger.info(f"🔍 Resolving proxy: {proxy_host}")
+        start_time = time.time()
+        
+        # Coalesce concurrent resolutions of the same host onto one lookup task.
+        # The task is owned by no caller, so cancelling any of them (including
+        # the one that started it) leaves the lookup running for the others.
+        # Forced refreshes only join each other: a normal lookup may be
+        # answered from the memory or SQLite cache
+        key = (proxy_host, force_refresh)
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            logger.debug("⏳ Awaiting in-flight resolution: %s", proxy_host)
+        else:
+            in_flight = asyncio.create_task(
+                self._resolve_uncached(proxy_host, start_time, force_refresh)
+            )
+            self._in_flight[key] = in_flight
+            in_flight.add_done_callback(
+                lambda task, key=key: self._finish_in_flight(key, task)
+            )
+        return await asyncio.shield(in_flight)
+    
+    def _finish_in_flight(self, key: Tuple[str, bool], task: "asyncio.Task[ResolvedProxy]"):
+        """Forget a finished lookup task"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every waiter was cancelled
+    
+    async def _resolve_uncached(
+        self,
+        proxy_host: str,
+        start_time: float,
+        force_refresh: bool = False
+    ) -> ResolvedProxy:
+        """Resolve DNS and geolocation for a host, then cache the result"""
+        if not force_refresh:
+            persisted = (await self._load_persisted([proxy_host])).get(proxy_host)
+            if persisted is not None:
+                logger.debug(
+                    "📋 Using persisted resolution: %s → %s (%s)",
+                    proxy_host, persisted.ip_address, persisted.timezone
+                )
+                return persisted
         
-        # Step 1: Resolve DNS
-        ip_address = await self._resolve_dns(proxy_host)
+        logger.info("🔍 Resolving proxy: %s", proxy_host)
+        
+        # Step 1: Resolve DNS. Without an offline database IP-API is the first
+        # geo source, so query it with the hostname meanwhile (ip-api.com
+        # resolves it itself) to hide DNS latency
+        speculative = None
+        if not self.geoip_manager.is_available() and not self._is_valid_ip(proxy_host):
+            speculative = asyncio.create_task(self._fetch_ip_api(proxy_host))
+        try:
+            ip_address = await self._resolve_dns(proxy_host)
+        except BaseException:
+            if speculative is not None:
+                speculative.cancel()
+            raise
         
         # Step 2: Detect timezone and geo with ACCURATE coordinates
-        timezone, geo_data = await self._detect_timezone_and_geo_accurate(ip_address)
+        result = None
+        use_online = True
+        if speculative is not None:
+            record = await speculative
+            # When local DNS failed, _resolve_dns hands back the hostname, so a
+            # retry would send ip-api the very same query
+            dns_failed = ip_address == proxy_host
+            # Otherwise only trust it if ip-api saw the same IP we will connect to
+            if record and (dns_failed or record.get('query') == ip_address):
+                result = self._parse_ip_api_record(record)
+            # A failed or repeated request would fail again; a mismatched IP is worth a retry
+            use_online = record is not None and not dns_failed
+        
+        if result is None:
+            result = await self._detect_timezone_and_geo_accurate(ip_address, use_online)
+        timezone, geo_data = result
         
         # Step 3: Create resolved proxy object
         resolution_time = (time.time() - start_time) * 1000
+        resolved = self._build_resolved_proxy(
+            proxy_host, ip_address, timezone, geo_data, resolution_time
+        )
+        
+        # Cache the result
+        self._cache_put(proxy_host, resolved)
+        await self._persist([resolved])
+        
+        self._log_resolution(resolved)
+        return resolved
+    
+    async def resolve_proxies(
+        self,
+        proxy_configs: List[Dict[str, str]],
+        force_refresh: bool = False
+    ) -> List[ResolvedProxy]:
+        """
+        Resolve many proxies at once (e.g. proxy pool warmup)
+        
+        DNS lookups run concurrently. IPs the offline GeoIP database cannot
+        place are geolocated with ip-api.com's batch endpoint instead of one
+        request per proxy; anything left gets the default timezone.
         
-        resolved = ResolvedProxy(
-            hostname=proxy_host,
+        Args:
+            proxy_configs: Proxy configuration dicts
+            force_refresh: Ignore cached resolutions
+        
+        Returns:
+            ResolvedProxy for each config, in input order
+        """
+        start_time = time.time()
+        
+        hosts = [config.get("host", "") for config in proxy_configs]
+        results: Dict[str, ResolvedProxy] = {}
+        pending = []
+        for host in dict.fromkeys(hosts):
+            if not host:
+                continue
+            cached = None if force_refresh else self._cache_get(host)
+            if cached is not None:
+                results[host] = cached
+            else:
+                pending.append(host)
+        
+        if pending and not force_refresh:
+            persisted = await self._load_persisted(pending)
+            results.update(persisted)
+            pending = [host for host in pending if host not in persisted]
+        
+        if pending:
+            logger.info(f"🔍 Resolving {len(pending)} proxies (batch)")
+            
+            ip_addresses = await asyncio.gather(*(self._resolve_dns(host) for host in pending))
+            
+            detected = {ip: self._detect_timezone_offline(ip) for ip in set(ip_addresses)}
+            unplaced = [ip for ip, result in detected.items() if result is None]
+            if unplaced:
+                detected.update(await self._lookup_ip_api_batch(unplaced))
+            resolution_time = (time.time() - start_time) * 1000
+            
+            for host, ip_address in zip(pending, ip_addresses):
+                result = detected.get(ip_address)
+                if result is None:
+                    result = await self._detect_timezone_and_geo_accurate(
+                        ip_address, use_online=False
+                    )
+                timezone, geo_data = result
+                
+                resolved = self._build_resolved_proxy(
+                    host, ip_address, timezone, geo_data, resolution_time
+                )
+                self._cache_put(host, resolved)
+                results[host] = resolved
+                self._log_resolution(resolved)
+            
+            await self._persist([results[host] for host in pending])
+        
+        resolved_list = []
+        for host in hosts:
+            if host:
+                resolved_list.append(results[host])
+            else:
+                resolved_list.append(ResolvedProxy(
+                    hostname="none",
+                    ip_address="",
+                    timezone="America/New_York",
+                    resolution_method="no_proxy"
+                ))
+        return resolved_list
+    
+    def _build_resolved_proxy(
+        self,
+        hostname: str,
+        ip_address: str,
+        timezone: str,
+        geo_data: Dict[str, Any],
+        resolution_time: float
+    ) -> ResolvedProxy:
+        """Create a ResolvedProxy from detection results"""
+        return ResolvedProxy(
+            hostname=hostname,
             ip_address=ip_address,
             timezone=timezone,
             city=geo_data.get('city'),
@@ -140,133 +449,131 @@ class IPResolver:
             resolution_method=geo_data.get('method', 'unknown'),
             resolution_time_ms=resolution_time
         )
+    
+    def _log_resolution(self, resolved: ResolvedProxy):
+        """Log a fresh resolution: one INFO line, location details at DEBUG"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
-        # Cache the result
-        self._resolution_cache[proxy_host] = resolved
-        
-        # Log results
-        logger.info(f"✅ Resolved: {proxy_host}")
-        logger.info(f"   IP: {ip_address}")
-        logger.info(f"   Timezone: {timezone}")
-        if resolved.city:
-            logger.info(f"   Location: {resolved.city}, {resolved.country}")
-        if resolved.latitude and resolved.longitude:
-            logger.info(f"   Coordinates: {resolved.latitude:.4f}, {resolved.longitude:.4f}")
-        logger.info(f"   Method: {resolved.resolution_method}")
-        logger.info(f"   Time: {resolution_time:.1f}ms")
+        logger.info(
+            "✅ Resolved %s ip=%s tz=%s city=%s method=%s ms=%.1f",
+            resolved.hostname, resolved.ip_address, resolved.timezone,
+            resolved.city, resolved.resolution_method, resolved.resolution_time_ms
+        )
+        if resolved.latitude and resolved.longitude and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "   Location: %s, %s (%.4f, %.4f)",
+                resolved.city, resolved.country, resolved.latitude, resolved.longitude
+            )
+    
+    async def _lookup_ip_api_batch(
+        self,
+        ip_addresses
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Geolocate IPs with ip-api.com's /batch endpoint
         
-        return resolved
+        Returns:
+            Dict of IP -> (timezone, geo_data) for IPs that resolved
+        """
+        results = {}
+        ip_list = list(ip_addresses)
+        
+        for i in range(0, len(ip_list), IP_API_BATCH_SIZE):
+            chunk = ip_list[i:i + IP_API_BATCH_SIZE]
+            try:
+                async with self._get_http_session().post(
+                    f"{IP_API_URL}/batch",
+                    json=[{'query': ip, 'fields': IP_API_FIELDS} for ip in chunk]
+                ) as response:
+                    records = _json_loads(await response.read()) if response.status == 200 else []
+            except Exception as e:
+                logger.debug(f"   IP-API batch failed: {str(e)[:80]}")
+                continue
+            
+            # Batch responses are returned in request order
+            for ip_address, data in zip(chunk, records):
+                parsed = self._parse_ip_api_record(data)
+                if parsed:
+                    results[ip_address] = parsed
+        
+        return results
+    
+    async def _fetch_ip_api(self, query: str) -> Optional[Dict[str, Any]]:
+        """Fetch the ip-api.com record for an IP or hostname (None on failure)"""
+        try:
+            async with self._get_http_session().get(
+                f"{IP_API_URL}/json/{query}",
+                params={'fields': IP_API_FIELDS}
+            ) as response:
+                return _json_loads(await response.read()) if response.status == 200 else None
+        
+        except Exception as e:
+            logger.debug(f"   IP-API failed: {str(e)[:80]}")
+            return None
+    
+    def _parse_ip_api_record(
+        self,
+        data: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Convert an ip-api.com record to (timezone, geo_data), or None if unusable"""
+        if not data or data.get('status') != 'success':
+            return None
+        
+        timezone = data.get('timezone')
+        city = data.get('city', '').casefold()
+        lat = data.get('lat')
+        lon = data.get('lon')
+        
+        # 🔥 CRITICAL: Verify coordinates match the city
+        # If GeoIP says "San Jose" but coords are for LA, trust the coords
+        coords_verified = self._verify_coordinates_match_city(
+            city, lat, lon, timezone
+        )
+        
+        if not (timezone and lat and lon):
+            return None
+        
+        geo_data = {
+            'method': 'ip_api_online_accurate',
+            'city': data.get('city'),
+            'country': data.get('country'),
+            'country_code': data.get('countryCode'),
+            'latitude': lat,
+            'longitude': lon,
+            'coords_verified': coords_verified
+        }
+        logger.debug("   IP-API: %s (%.4f, %.4f) → %s", city, lat, lon, timezone)
+        return timezone, geo_data
     
     async def _detect_timezone_and_geo_accurate(
         self,
-        ip_address: str
+        ip_address: str,
+        use_online: bool = True
     ) -> Tuple[str, Dict[str, Any]]:
         """
         🆕 FIXED: Detect timezone with ACCURATE coordinates
         
         Strategy:
-        1. Try online IP-API first (most accurate for coordinates)
-        2. Fall back to GeoIP + timezone-based coords
+        1. Offline GeoIP + timezone-based coords (memory-mapped, no network)
+        2. Fall back to online IP-API
         3. Use timezone default coordinates as last resort
-        """
-        geo_data = {}
         
-        # Method 1: Online IP-API (MOST ACCURATE for coordinates)
-        try:
-            import requests
-            
-            logger.debug(f"   Trying IP-API (most accurate) for {ip_address}")
-            
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: requests.get(
-                    f"http://ip-api.com/json/{ip_address}",
-                    params={'fields': 'status,timezone,city,country,countryCode,lat,lon'},
-                    timeout=5
-                )
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get('status') == 'success':
-                    timezone = data.get('timezone')
-                    city = data.get('city', '').lower()
-                    lat = data.get('lat')
-                    lon = data.get('lon')
-                    
-                    # 🔥 CRITICAL: Verify coordinates match the city
-                    # If GeoIP says "San Jose" but coords are for LA, trust the coords
-                    coords_verified = self._verify_coordinates_match_city(
-                        city, lat, lon, timezone
-                    )
-                    
-                    if timezone and lat and lon:
-                        geo_data = {
-                            'method': 'ip_api_online_accurate',
-                            'city': data.get('city'),
-                            'country': data.get('country'),
-                            'country_code': data.get('countryCode'),
-                            'latitude': lat,
-                            'longitude': lon,
-                            'coords_verified': coords_verified
-                        }
-                        logger.debug(f"   IP-API: {city} ({lat:.4f}, {lon:.4f}) → {timezone}")
-                        return timezone, geo_data
+        Args:
+            ip_address: IP address to geolocate
+            use_online: Try IP-API (disable when the caller already asked it)
+        """
+        # Method 1: Offline GeoIP + Timezone-based coordinate correction
+        offline = self._detect_timezone_offline(ip_address)
+        if offline:
+            return offline
         
-        except Exception as e:
-            logger.debug(f"   IP-API failed: {str(e)[:80]}")
-        
-        # Method 2: Offline GeoIP + Timezone-based coordinate correction
-        if self.geoip_manager.is_available():
-            geoip_record = self.geoip_manager.lookup_ip(ip_address)
-            
-            if geoip_record:
-                city = geoip_record.get('city', '').lower()
-                country_code = geoip_record.get('country_code', '')
-                geoip_lat = geoip_record.get('latitude')
-                geoip_lon = geoip_record.get('longitude')
-                
-                # Detect timezone from coordinates
-                if country_code == 'US' and geoip_lat and geoip_lon:
-                    timezone = self._detect_us_timezone_from_coords(geoip_lat, geoip_lon)
-                else:
-                    timezone = self.timezone_manager.get_timezone_for_location(
-                        city=city,
-                        country=country_code
-                    )
-                
-                if timezone:
-                    # 🔥 CRITICAL FIX: Use timezone default coords instead of GeoIP coords
-                    # This ensures consistency (e.g., LA timezone gets LA coords, not San Jose)
-                    if timezone in self.TIMEZONE_DEFAULT_COORDS:
-                        corrected_lat, corrected_lon = self.TIMEZONE_DEFAULT_COORDS[timezone]
-                        logger.debug(f"   ✅ Using timezone default coords for {timezone}")
-                        logger.debug(f"      GeoIP: {city} ({geoip_lat:.4f}, {geoip_lon:.4f})")
-                        logger.debug(f"      Using: {timezone} default ({corrected_lat:.4f}, {corrected_lon:.4f})")
-                        
-                        geo_data = {
-                            'method': 'geoip_offline_timezone_corrected',
-                            'city': self._get_city_from_timezone(timezone),  # Use timezone's main city
-                            'country': geoip_record.get('country_name'),
-                            'country_code': country_code,
-                            'latitude': corrected_lat,
-                            'longitude': corrected_lon,
-                            'geoip_original_city': city,  # Keep original for reference
-                            'coords_corrected': True
-                        }
-                        return timezone, geo_data
-                    else:
-                        # Use GeoIP coords if no timezone default available
-                        geo_data = {
-                            'method': 'geoip_offline',
-                            'city': city.title() if city else None,
-                            'country': geoip_record.get('country_name'),
-                            'country_code': country_code,
-                            'latitude': geoip_lat,
-                            'longitude': geoip_lon,
-                        }
-                        return timezone, geo_data
+        # Method 2: Online IP-API
+        if use_online:
+            logger.debug(f"   Trying IP-API for {ip_address}")
+            parsed = self._parse_ip_api_record(await self._fetch_ip_api(ip_address))
+            if parsed:
+                return parsed
         
         # Method 3: Default timezone with default coordinates
         default_timezone = "America/Los_Angeles"
@@ -286,6 +593,62 @@ class IPResolver:
         
         return default_timezone, geo_data
     
+    def _detect_timezone_offline(self, ip_address: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Detect timezone from the offline GeoIP database (None if it cannot)"""
+        if not self.geoip_manager.is_available():
+            return None
+        
+        geoip_record = self.geoip_manager.lookup_ip(ip_address)
+        
+        if geoip_record:
+            city = geoip_record.get('city', '').casefold()
+            country_code = geoip_record.get('country_code', '')
+            geoip_lat = geoip_record.get('latitude')
+            geoip_lon = geoip_record.get('longitude')
+            
+            # Detect timezone from coordinates
+            if country_code == 'US' and geoip_lat and geoip_lon:
+                timezone = self._detect_us_timezone_from_coords(geoip_lat, geoip_lon)
+            else:
+                timezone = self.timezone_manager.get_timezone_for_location(
+                    city=city,
+                    country=country_code
+                )
+            
+            if timezone:
+                # 🔥 CRITICAL FIX: Use timezone default coords instead of GeoIP coords
+                # This ensures consistency (e.g., LA timezone gets LA coords, not San Jose)
+                if timezone in self.TIMEZONE_DEFAULT_COORDS:
+                    corrected_lat, corrected_lon = self.TIMEZONE_DEFAULT_COORDS[timezone]
+                    logger.debug(f"   ✅ Using timezone default coords for {timezone}")
+                    logger.debug(f"      GeoIP: {city} ({geoip_lat:.4f}, {geoip_lon:.4f})")
+                    logger.debug(f"      Using: {timezone} default ({corrected_lat:.4f}, {corrected_lon:.4f})")
+                    
+                    geo_data = {
+                        'method': 'geoip_offline_timezone_corrected',
+                        'city': self._get_city_from_timezone(timezone),  # Use timezone's main city
+                        'country': geoip_record.get('country_name'),
+                        'country_code': country_code,
+                        'latitude': corrected_lat,
+                        'longitude': corrected_lon,
+                        'geoip_original_city': city,  # Keep original for reference
+                        'coords_corrected': True
+                    }
+                    return timezone, geo_data
+                else:
+                    # Use GeoIP coords if no timezone default available
+                    geo_data = {
+                        'method': 'geoip_offline',
+                        'city': city.title() if city else None,
+                        'country': geoip_record.get('country_name'),
+                        'country_code': country_code,
+                        'latitude': geoip_lat,
+                        'longitude': geoip_lon,
+                    }
+                    return timezone, geo_data
+        
+        return None
+    
     def _verify_coordinates_match_city(
         self,
         city: str,
@@ -301,11 +664,10 @@ class IPResolver:
         if not city or not lat or not lon:
             return False
         
-        city_lower = city.lower()
-        
-        # Check if city has known coordinates
-        if city_lower in self.CITY_COORDS:
-            expected_lat, expected_lon = self.CITY_COORDS[city_lower]
+        # Check if city has known coordinates (single lookup)
+        expected = self.CITY_COORDS.get(city.casefold())
+        if expected is not None:
+            expected_lat, expected_lon = expected
             # Allow 1 degree variance (~70 miles)
             lat_diff = abs(lat - expected_lat)
             lon_diff = abs(lon - expected_lon)
@@ -338,13 +700,22 @@ class IPResolver:
             logger.debug(f"   DNS: Already an IP: {hostname}")
             return hostname
         
+        # Resolve on the event loop with aiodns (no executor thread per lookup)
+        if AIODNS_AVAILABLE:
+            try:
+                result = await _shared_dns_resolver().gethostbyname(hostname, socket.AF_INET)
+                ip_address = result.addresses[0]
+                
+                logger.debug(f"   DNS: {hostname} → {ip_address}")
+                return ip_address
+            
+            except Exception as e:
+                logger.debug(f"   aiodns failed for {hostname}: {e} - falling back to getaddrinfo")
+        
         try:
-            loop = asyncio.get_event_loop()
-            ip_address = await loop.run_in_executor(
-                None,
-                socket.gethostbyname,
-                hostname
-            )
+            loop = asyncio.get_running_loop()
+            addr_info = await loop.getaddrinfo(hostname, None, family=socket.AF_INET)
+            ip_address = addr_info[0][4][0]
             
             logger.debug(f"   DNS: {hostname} → {ip_address}")
             return ip_address
@@ -353,12 +724,13 @@ class IPResolver:
             logger.error(f"❌ DNS resolution failed for {hostname}: {e}")
             return hostname
     
-    def _is_valid_ip(self, ip_str: str) -> bool:
-        """Check if string is a valid IPv4 address"""
+    @staticmethod
+    def _is_valid_ip(ip_str: str) -> bool:
+        """Check if string is a valid dotted-quad IPv4 address"""
         try:
-            parts = [int(p) for p in ip_str.split('.')]
-            return len(parts) == 4 and all(0 <= p <= 255 for p in parts)
-        except:
+            ipaddress.IPv4Address(ip_str)
+            return True
+        except ValueError:
             return False
     
     def _detect_us_timezone_from_coords(self, latitude: float, longitude: float) -> Optional[str]:
@@ -366,26 +738,178 @@ class IPResolver:
         if not latitude or not longitude:
             return None
         
-        if longitude < -120:
-            if 31 <= latitude <= 37 and -114.8 <= longitude <= -109:
-                return 'America/Phoenix'
-            return 'America/Los_Angeles'
-        elif -120 <= longitude < -104:
-            if 31 <= latitude <= 37 and -114.8 <= longitude <= -109:
-                return 'America/Phoenix'
-            return 'America/Denver'
-        elif -104 <= longitude < -87:
-            return 'America/Chicago'
-        else:
-            return 'America/New_York'
+        # Arizona (no DST) lies inside the Mountain longitude band
+        if 31 <= latitude <= 37 and -114.8 <= longitude <= -109:
+            return 'America/Phoenix'
+        
+        # bisect_right: a longitude on a boundary belongs to the band east of it
+        return _US_LON_TIMEZONES[bisect_right(_US_LON_BINS, longitude)]
+    
+    def _get_http_session(self):
+        """Get the HTTP session shared by all resolvers on the running loop"""
+        return _shared_http_session()
+    
+    async def aclose(self):
+        """
+        Release async resources
+        
+        Closes the running loop's shared HTTP session (reopened on next use)
+        and this resolver's SQLite cache connection. After that, resolutions
+        are no longer persisted; the in-memory cache keeps working.
+        """
+        await close_shared_clients()
+        if self._db is not None:
+            await asyncio.to_thread(self._db_close)
+    
+    def _cache_get(self, hostname: str) -> Optional[ResolvedProxy]:
+        """Return a live cache entry (marking it recently used), dropping it if expired"""
+        entry = self._resolution_cache.get(hostname)
+        if entry is None:
+            return None
+        
+        expiry, resolved = entry
+        if time.monotonic() >= expiry:
+            del self._resolution_cache[hostname]
+            return None
+        
+        self._resolution_cache.move_to_end(hostname)
+        return resolved
+    
+    def _cache_put(self, hostname: str, resolved: ResolvedProxy, ttl: float = DNS_TTL):
+        """Cache a resolution for ttl seconds, evicting the least recently used entry when full"""
+        self._resolution_cache[hostname] = (time.monotonic() + ttl, resolved)
+        self._resolution_cache.move_to_end(hostname)
+        if len(self._resolution_cache) > self._cache_size:
+            self._resolution_cache.popitem(last=False)
+    
+    @staticmethod
+    def _open_cache_db(path: Path) -> Optional[sqlite3.Connection]:
+        """Open (creating if needed) the persistent resolution cache"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS resolved("
+                "host TEXT PRIMARY KEY, expiry REAL, data TEXT)"
+            )
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Resolution cache DB unavailable ({path}): {e}")
+            return None
+    
+    async def _load_persisted(self, hostnames: List[str]) -> Dict[str, ResolvedProxy]:
+        """Load unexpired persisted resolutions into the memory cache"""
+        if self._db is None:
+            return {}
+        
+        try:
+            rows = await asyncio.to_thread(self._db_select, hostnames)
+        except sqlite3.Error as e:
+            logger.debug(f"   Resolution cache DB read failed: {e}")
+            return {}
+        
+        loaded = {}
+        corrupt = []
+        now = time.time()
+        for host, expiry, data in rows:
+            try:
+                resolved = ResolvedProxy(**_json_loads(data))
+            except (TypeError, ValueError) as e:
+                # Undecodable or written by an incompatible version - drop the row
+                logger.debug(f"   Discarding persisted resolution for {host}: {e}")
+                corrupt.append(host)
+                continue
+            self._cache_put(host, resolved, ttl=expiry - now)
+            loaded[host] = resolved
+        
+        if corrupt:
+            try:
+                await asyncio.to_thread(self._db_delete, corrupt)
+            except sqlite3.Error as e:
+                logger.debug(f"   Resolution cache DB delete failed: {e}")
+        return loaded
+    
+    async def _persist(self, resolutions: List[ResolvedProxy]):
+        """Write fresh resolutions to the persistent cache"""
+        if self._db is None:
+            return
+        
+        # Default fallbacks are guesses - retry them on the next run instead
+        expiry = time.time() + DNS_TTL
+        rows = [
+            (resolved.hostname, expiry, json.dumps(asdict(resolved)))
+            for resolved in resolutions
+            if not resolved.resolution_method.startswith('default_fallback')
+        ]
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self._db_upsert, rows)
+        except sqlite3.Error as e:
+            logger.debug(f"   Resolution cache DB write failed: {e}")
+    
+    def _db_select(self, hostnames: List[str]) -> List[Tuple[str, float, str]]:
+        """Fetch unexpired (host, expiry, data) rows (blocking)"""
+        now = time.time()
+        with self._db_lock:
+            db = self._locked_db()
+            return [
+                row for host in hostnames
+                for row in db.execute(
+                    "SELECT host, expiry, data FROM resolved WHERE host = ? AND expiry > ?",
+                    (host, now)
+                )
+            ]
+    
+    def _db_upsert(self, rows: List[Tuple[str, float, str]]):
+        """Insert or replace (host, expiry, data) rows (blocking)"""
+        with self._db_lock:
+            db = self._locked_db()
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO resolved(host, expiry, data) VALUES (?, ?, ?)",
+                    rows
+                )
+    
+    def _db_delete(self, hostnames: List[str]):
+        """Delete rows for the given hosts (blocking)"""
+        with self._db_lock:
+            db = self._locked_db()
+            with db:
+                db.executemany(
+                    "DELETE FROM resolved WHERE host = ?",
+                    [(host,) for host in hostnames]
+                )
+    
+    def _locked_db(self) -> sqlite3.Connection:
+        """Get the DB connection; call with _db_lock held (raises once aclose() closed it)"""
+        if self._db is None:
+            raise sqlite3.ProgrammingError("Resolution cache DB is closed")
+        return self._db
+    
+    def _db_close(self):
+        """Close the DB connection (blocking)"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
     
     def get_cached_resolution(self, hostname: str) -> Optional[ResolvedProxy]:
-        """Get cached resolution for hostname"""
-        return self._resolution_cache.get(hostname)
+        """Get cached resolution for hostname (None if missing or expired)"""
+        return self._cache_get(hostname)
     
     def clear_cache(self):
         """Clear resolution cache"""
         self._resolution_cache.clear()
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    db = self._locked_db()
+                    with db:
+                        db.execute("DELETE FROM resolved")
+            except sqlite3.Error as e:
+                logger.debug(f"   Resolution cache DB clear failed: {e}")
         logger.info("🗑️ Resolution cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -1,6 +1,8 @@
 # src/utils/logging_config.py
 
 import logging
+import logging.handlers
+import re
 import sys
 
 # Optional: Try to import colorlog for colored output
@@ -10,61 +12,145 @@ try:
 except ImportError:
     COLORLOG_AVAILABLE = False
 
+# Define a standard format
+LOG_FORMAT = (
+    "%(asctime)s - "
+    "%(name)s - "
+    "%(levelname)s - "
+    "%(message)s"
+)
+
+# Define a colored format if colorlog is installed
+COLOR_LOG_FORMAT = (
+    "%(log_color)s%(asctime)s - "
+    "%(name)s - "
+    "%(levelname)s - "
+    "%(message)s"
+)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# When stdout is not a terminal, records are buffered and written in batches;
+# WARNING and above flush at once
+LOG_BUFFER_CAPACITY = 256
+LOG_FLUSH_LEVEL = logging.WARNING
+
+# Emoji/pictographs (with an optional variation selector) and the space after them
+_EMOJI_RE = re.compile(r'[\U0001F300-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF]\uFE0F?\s?')
+
+
+class _CachedTimeMixin:
+    """
+    Formats %(asctime)s once per wall-clock second instead of once per record.
+    Only valid for datefmts without sub-second fields (DATE_FORMAT).
+    """
+
+    _cached_time = (None, None)  # (second, formatted) - swapped as one tuple
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = super().formatTime(record, datefmt)
+            self._cached_time = (second, formatted)
+        return formatted
+
+
+class CachedFormatter(_CachedTimeMixin, logging.Formatter):
+    """Standard formatter with per-second timestamp caching."""
+
+
+if COLORLOG_AVAILABLE:
+    class CachedColoredFormatter(_CachedTimeMixin, ColoredFormatter):
+        """Colored formatter with per-second timestamp caching."""
+
+# Formatter is built once at import and shared by every setup_logging() call
+# Use ColoredFormatter if available, otherwise fall back to standard Formatter
+if COLORLOG_AVAILABLE:
+    _FORMATTER = CachedColoredFormatter(
+        COLOR_LOG_FORMAT,
+        datefmt=DATE_FORMAT,
+        reset=True,
+        log_colors={
+            'DEBUG':    'cyan',
+            'INFO':     'green',
+            'WARNING':  'yellow',
+            'ERROR':    'red',
+            'CRITICAL': 'red,bg_white',
+        },
+        secondary_log_colors={},
+        style='%'
+    )
+else:
+    _FORMATTER = CachedFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+
+class _StripEmojiFormatter(logging.Formatter):
+    """
+    Removes emoji from the formatted line written to pipes, files and CI logs.
+    Works on the output, so %-args are covered and the shared record is untouched.
+    """
+
+    def __init__(self, formatter):
+        super().__init__()
+        self._formatter = formatter
+
+    def format(self, record):
+        return _EMOJI_RE.sub('', self._formatter.format(record))
+
+
+_PLAIN_FORMATTER = _StripEmojiFormatter(_FORMATTER)
+
+# Handler and level installed by the last setup_logging() call
+_handler = None
+_configured_level = None
+
 def setup_logging(level=logging.INFO):
     """
     Sets up a standardized logger for the application.
-    
+
     If colorlog is available, it provides colored output for better readability.
     Otherwise, it falls back to a standard formatter.
+
+    Idempotent: repeated calls with the same level are no-ops while the
+    handler is still installed on the root logger.
     """
+    global _handler, _configured_level
+
     root_logger = logging.getLogger()
+    if level == _configured_level and _handler in root_logger.handlers:
+        return
+
+    first_setup = _handler is None
     root_logger.setLevel(level)
 
+    # Write out anything still buffered by a previous setup
+    if _handler is not None:
+        _handler.close()
+
     # Prevent duplicate handlers if this function is called multiple times
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
-    # Define a standard format
-    log_format = (
-        "%(asctime)s - "
-        "%(name)s - "
-        "%(levelname)s - "
-        "%(message)s"
-    )
-    
-    # Define a colored format if colorlog is installed
-    color_log_format = (
-        "%(log_color)s%(asctime)s - "
-        "%(name)s - "
-        "%(levelname)s - "
-        "%(message)s"
-    )
-
-    # Use ColoredFormatter if available, otherwise fall back to standard Formatter
-    if COLORLOG_AVAILABLE:
-        formatter = ColoredFormatter(
-            color_log_format,
-            datefmt="%Y-%m-%d %H:%M:%S",
-            reset=True,
-            log_colors={
-                'DEBUG':    'cyan',
-                'INFO':     'green',
-                'WARNING':  'yellow',
-                'ERROR':    'red',
-                'CRITICAL': 'red,bg_white',
-            },
-            secondary_log_colors={},
-            style='%'
-        )
-    else:
-        formatter = logging.Formatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
-
     # Create a handler to write to the console (stdout)
+    # (emoji are stripped when writing to pipes, files and CI logs)
+    is_tty = sys.stdout.isatty()
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
-    
+    handler.setFormatter(_FORMATTER if is_tty else _PLAIN_FORMATTER)
+    if not is_tty:
+        # Buffer records for pipes/files (logging.shutdown() flushes the rest at exit);
+        # an interactive terminal stays unbuffered
+        handler = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=LOG_FLUSH_LEVEL,
+            target=handler,
+            flushOnClose=True
+        )
+
     # Add the handler to the root logger
     root_logger.addHandler(handler)
+    _handler = handler
+    _configured_level = level
 
     # Silence overly verbose libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -72,6 +158,6 @@ def setup_logging(level=logging.INFO):
 
     # Get the root logger for the main application part
     logger = logging.getLogger(__name__)
-    if not COLORLOG_AVAILABLE:
+    if not COLORLOG_AVAILABLE and first_setup:
         logger.warning("`colorlog` package not found. Logging will not be colored.")
         logger.warning("Install with: pip install colorlog")
@@ -5,225 +5,287 @@ Handles timezone detection from IPs, cities, countries, and hostname patterns
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+import sys
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+def _intern_values(mapping: Dict[str, str]) -> Mapping[str, str]:
+    """Intern timezone values (every lookup hands out the same str objects) and freeze the map"""
+    return MappingProxyType({key: sys.intern(value) for key, value in mapping.items()})
+
+
+# Fallback timezone for configs and undetectable IPs
+_DEFAULT_TZ = sys.intern('America/New_York')
+
+# Comprehensive city timezone mapping
+CITY_TIMEZONE_MAP = _intern_values({
+    # United States - Major Cities
+    'los angeles': 'America/Los_Angeles',
+    'san francisco': 'America/Los_Angeles',
+    'san jose': 'America/Los_Angeles',  # 🆕 ADDED - Silicon Valley
+    'seattle': 'America/Los_Angeles',
+    'portland': 'America/Los_Angeles',
+    'las vegas': 'America/Los_Angeles',
+    'san diego': 'America/Los_Angeles',
+    'sacramento': 'America/Los_Angeles',
+    'oakland': 'America/Los_Angeles',
+    'phoenix': 'America/Phoenix',
+    'denver': 'America/Denver',
+    'salt lake city': 'America/Denver',
+    'chicago': 'America/Chicago',
+    'dallas': 'America/Chicago',
+    'houston': 'America/Chicago',
+    'austin': 'America/Chicago',
+    'new york': 'America/New_York',
+    'boston': 'America/New_York',
+    'miami': 'America/New_York',
+    'atlanta': 'America/New_York',
+    'washington': 'America/New_York',
+    'philadelphia': 'America/New_York',
+    
+    # Canada
+    'toronto': 'America/Toronto',
+    'montreal': 'America/Toronto',
+    'ottawa': 'America/Toronto',
+    'vancouver': 'America/Vancouver',
+    'calgary': 'America/Edmonton',
+    'edmonton': 'America/Edmonton',
+    
+    # Europe
+    'london': 'Europe/London',
+    'manchester': 'Europe/London',
+    'paris': 'Europe/Paris',
+    'marseille': 'Europe/Paris',
+    'berlin': 'Europe/Berlin',
+    'munich': 'Europe/Berlin',
+    'frankfurt': 'Europe/Berlin',
+    'amsterdam': 'Europe/Amsterdam',
+    'brussels': 'Europe/Brussels',
+    'madrid': 'Europe/Madrid',
+    'barcelona': 'Europe/Madrid',
+    'rome': 'Europe/Rome',
+    'milan': 'Europe/Rome',
+    'vienna': 'Europe/Vienna',
+    'zurich': 'Europe/Zurich',
+    'stockholm': 'Europe/Stockholm',
+    'oslo': 'Europe/Oslo',
+    'copenhagen': 'Europe/Copenhagen',
+    'dublin': 'Europe/Dublin',
+    'lisbon': 'Europe/Lisbon',
+    'prague': 'Europe/Prague',
+    'warsaw': 'Europe/Warsaw',
+    'budapest': 'Europe/Budapest',
+    'moscow': 'Europe/Moscow',
+    
+    # Asia
+    'tokyo': 'Asia/Tokyo',
+    'osaka': 'Asia/Tokyo',
+    'singapore': 'Asia/Singapore',
+    'hong kong': 'Asia/Hong_Kong',
+    'shanghai': 'Asia/Shanghai',
+    'beijing': 'Asia/Shanghai',
+    'seoul': 'Asia/Seoul',
+    'mumbai': 'Asia/Kolkata',
+    'delhi': 'Asia/Kolkata',
+    'bangalore': 'Asia/Kolkata',
+    'dubai': 'Asia/Dubai',
+    'bangkok': 'Asia/Bangkok',
+    'manila': 'Asia/Manila',
+    'jakarta': 'Asia/Jakarta',
+    'kuala lumpur': 'Asia/Kuala_Lumpur',
+    'taipei': 'Asia/Taipei',
+    
+    # Australia
+    'sydney': 'Australia/Sydney',
+    'melbourne': 'Australia/Sydney',
+    'brisbane': 'Australia/Brisbane',
+    'perth': 'Australia/Perth',
+    'adelaide': 'Australia/Adelaide',
+    
+    # Africa
+    'nairobi': 'Africa/Nairobi',
+    'johannesburg': 'Africa/Johannesburg',
+    'cairo': 'Africa/Cairo',
+    'lagos': 'Africa/Lagos',
+    
+    # South America
+    'sao paulo': 'America/Sao_Paulo',
+    'rio de janeiro': 'America/Sao_Paulo',
+    'buenos aires': 'America/Argentina/Buenos_Aires',
+    'santiago': 'America/Santiago',
+    'bogota': 'America/Bogota',
+    'lima': 'America/Lima',
+})
+
+# Country to default timezone mapping
+COUNTRY_TIMEZONE_MAP = _intern_values({
+    'US': 'America/New_York',
+    'CA': 'America/Toronto',
+    'GB': 'Europe/London',
+    'UK': 'Europe/London',
+    'DE': 'Europe/Berlin',
+    'FR': 'Europe/Paris',
+    'IT': 'Europe/Rome',
+    'ES': 'Europe/Madrid',
+    'NL': 'Europe/Amsterdam',
+    'BE': 'Europe/Brussels',
+    'CH': 'Europe/Zurich',
+    'AT': 'Europe/Vienna',
+    'SE': 'Europe/Stockholm',
+    'NO': 'Europe/Oslo',
+    'DK': 'Europe/Copenhagen',
+    'FI': 'Europe/Helsinki',
+    'PL': 'Europe/Warsaw',
+    'CZ': 'Europe/Prague',
+    'RU': 'Europe/Moscow',
+    'JP': 'Asia/Tokyo',
+    'CN': 'Asia/Shanghai',
+    'KR': 'Asia/Seoul',
+    'SG': 'Asia/Singapore',
+    'HK': 'Asia/Hong_Kong',
+    'IN': 'Asia/Kolkata',
+    'TH': 'Asia/Bangkok',
+    'PH': 'Asia/Manila',
+    'ID': 'Asia/Jakarta',
+    'MY': 'Asia/Kuala_Lumpur',
+    'TW': 'Asia/Taipei',
+    'AU': 'Australia/Sydney',
+    'NZ': 'Pacific/Auckland',
+    'BR': 'America/Sao_Paulo',
+    'AR': 'America/Argentina/Buenos_Aires',
+    'CL': 'America/Santiago',
+    'MX': 'America/Mexico_City',
+    'ZA': 'Africa/Johannesburg',
+    'KE': 'Africa/Nairobi',
+    'EG': 'Africa/Cairo',
+    'NG': 'Africa/Lagos',
+    'AE': 'Asia/Dubai',
+    'SA': 'Asia/Riyadh',
+    'TR': 'Europe/Istanbul',
+    'IL': 'Asia/Jerusalem',
+})
+
+# Hostname pattern to timezone mapping
+HOSTNAME_PATTERNS = _intern_values({
+    # US regions
+    'east': 'America/New_York',
+    'newyork': 'America/New_York',
+    'nyc': 'America/New_York',
+    'virginia': 'America/New_York',
+    'boston': 'America/New_York',
+    'miami': 'America/New_York',
+    'atlanta': 'America/New_York',
+    
+    'west': 'America/Los_Angeles',
+    'losangeles': 'America/Los_Angeles',
+    'california': 'America/Los_Angeles',
+    'sanfrancisco': 'America/Los_Angeles',
+    'seattle': 'America/Los_Angeles',
+    'portland': 'America/Los_Angeles',
+    
+    'central': 'America/Chicago',
+    'chicago': 'America/Chicago',
+    'dallas': 'America/Chicago',
+    'texas': 'America/Chicago',
+    
+    'mountain': 'America/Denver',
+    'denver': 'America/Denver',
+    'phoenix': 'America/Phoenix',
+    
+    # European cities
+    'london': 'Europe/London',
+    'paris': 'Europe/Paris',
+    'berlin': 'Europe/Berlin',
+    'frankfurt': 'Europe/Berlin',
+    'amsterdam': 'Europe/Amsterdam',
+    'madrid': 'Europe/Madrid',
+    'rome': 'Europe/Rome',
+    'stockholm': 'Europe/Stockholm',
+    'warsaw': 'Europe/Warsaw',
+    'moscow': 'Europe/Moscow',
+    
+    # Asian cities
+    'tokyo': 'Asia/Tokyo',
+    'singapore': 'Asia/Singapore',
+    'hongkong': 'Asia/Hong_Kong',
+    'shanghai': 'Asia/Shanghai',
+    'beijing': 'Asia/Shanghai',
+    'seoul': 'Asia/Seoul',
+    'mumbai': 'Asia/Kolkata',
+    'bangalore': 'Asia/Kolkata',
+    'dubai': 'Asia/Dubai',
+    'bangkok': 'Asia/Bangkok',
+    
+    # Australia
+    'sydney': 'Australia/Sydney',
+    'melbourne': 'Australia/Sydney',
+    'brisbane': 'Australia/Brisbane',
+    'perth': 'Australia/Perth',
+})
+
+# Every timezone the maps can produce (validate_timezone fallback)
+_KNOWN_TIMEZONES = frozenset(CITY_TIMEZONE_MAP.values()) | frozenset(COUNTRY_TIMEZONE_MAP.values())
+
+
+def _build_hostname_automaton(patterns: Mapping[str, str]):
+    """Compile hostname patterns into one Aho-Corasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for priority, (pattern, timezone) in enumerate(patterns.items()):
+        automaton.add_word(pattern, (priority, pattern, timezone))
+    automaton.make_automaton()
+    return automaton
+
+
+# Automaton for the shared, frozen HOSTNAME_PATTERNS (None without pyahocorasick)
+_HOSTNAME_AUTOMATON = _build_hostname_automaton(HOSTNAME_PATTERNS) if AHOCORASICK_AVAILABLE else None
+
+
+# Valid timezone names for validate_timezone, built on first use and shared
+# by every instance (pytz.all_timezones is a list - a frozenset makes membership O(1))
+_PYTZ_SET: Optional[frozenset] = None
+
+
+def _valid_timezones() -> frozenset:
+    """Get the valid timezone set, importing pytz only on first call"""
+    global _PYTZ_SET
+    if _PYTZ_SET is None:
+        try:
+            import pytz
+            _PYTZ_SET = frozenset(pytz.all_timezones)
+        except ImportError:
+            # Fallback: Check if it's in our known timezones
+            _PYTZ_SET = _KNOWN_TIMEZONES
+    return _PYTZ_SET
+
+
 class TimezoneManager:
     """
     Manages timezone detection and mapping
     """
     
-    # Comprehensive city timezone mapping
-    CITY_TIMEZONE_MAP = {
-        # United States - Major Cities
-        'los angeles': 'America/Los_Angeles',
-        'san francisco': 'America/Los_Angeles',
-        'san jose': 'America/Los_Angeles',  # 🆕 ADDED - Silicon Valley
-        'seattle': 'America/Los_Angeles',
-        'portland': 'America/Los_Angeles',
-        'las vegas': 'America/Los_Angeles',
-        'san diego': 'America/Los_Angeles',
-        'sacramento': 'America/Los_Angeles',
-        'oakland': 'America/Los_Angeles',
-        'phoenix': 'America/Phoenix',
-        'denver': 'America/Denver',
-        'salt lake city': 'America/Denver',
-        'chicago': 'America/Chicago',
-        'dallas': 'America/Chicago',
-        'houston': 'America/Chicago',
-        'austin': 'America/Chicago',
-        'new york': 'America/New_York',
-        'boston': 'America/New_York',
-        'miami': 'America/New_York',
-        'atlanta': 'America/New_York',
-        'washington': 'America/New_York',
-        'philadelphia': 'America/New_York',
-        
-        # Canada
-        'toronto': 'America/Toronto',
-        'montreal': 'America/Toronto',
-        'ottawa': 'America/Toronto',
-        'vancouver': 'America/Vancouver',
-        'calgary': 'America/Edmonton',
-        'edmonton': 'America/Edmonton',
-        
-        # Europe
-        'london': 'Europe/London',
-        'manchester': 'Europe/London',
-        'paris': 'Europe/Paris',
-        'marseille': 'Europe/Paris',
-        'berlin': 'Europe/Berlin',
-        'munich': 'Europe/Berlin',
-        'frankfurt': 'Europe/Berlin',
-        'amsterdam': 'Europe/Amsterdam',
-        'brussels': 'Europe/Brussels',
-        'madrid': 'Europe/Madrid',
-        'barcelona': 'Europe/Madrid',
-        'rome': 'Europe/Rome',
-        'milan': 'Europe/Rome',
-        'vienna': 'Europe/Vienna',
-        'zurich': 'Europe/Zurich',
-        'stockholm': 'Europe/Stockholm',
-        'oslo': 'Europe/Oslo',
-        'copenhagen': 'Europe/Copenhagen',
-        'dublin': 'Europe/Dublin',
-        'lisbon': 'Europe/Lisbon',
-        'prague': 'Europe/Prague',
-        'warsaw': 'Europe/Warsaw',
-        'budapest': 'Europe/Budapest',
-        'moscow': 'Europe/Moscow',
-        
-        # Asia
-        'tokyo': 'Asia/Tokyo',
-        'osaka': 'Asia/Tokyo',
-        'singapore': 'Asia/Singapore',
-        'hong kong': 'Asia/Hong_Kong',
-        'shanghai': 'Asia/Shanghai',
-        'beijing': 'Asia/Shanghai',
-        'seoul': 'Asia/Seoul',
-        'mumbai': 'Asia/Kolkata',
-        'delhi': 'Asia/Kolkata',
-        'bangalore': 'Asia/Kolkata',
-        'dubai': 'Asia/Dubai',
-        'bangkok': 'Asia/Bangkok',
-        'manila': 'Asia/Manila',
-        'jakarta': 'Asia/Jakarta',
-        'kuala lumpur': 'Asia/Kuala_Lumpur',
-        'taipei': 'Asia/Taipei',
-        
-        # Australia
-        'sydney': 'Australia/Sydney',
-        'melbourne': 'Australia/Sydney',
-        'brisbane': 'Australia/Brisbane',
-        'perth': 'Australia/Perth',
-        'adelaide': 'Australia/Adelaide',
-        
-        # Africa
-        'nairobi': 'Africa/Nairobi',
-        'johannesburg': 'Africa/Johannesburg',
-        'cairo': 'Africa/Cairo',
-        'lagos': 'Africa/Lagos',
-        
-        # South America
-        'sao paulo': 'America/Sao_Paulo',
-        'rio de janeiro': 'America/Sao_Paulo',
-        'buenos aires': 'America/Argentina/Buenos_Aires',
-        'santiago': 'America/Santiago',
-        'bogota': 'America/Bogota',
-        'lima': 'America/Lima',
-    }
-    
-    # Country to default timezone mapping
-    COUNTRY_TIMEZONE_MAP = {
-        'US': 'America/New_York',
-        'CA': 'America/Toronto',
-        'GB': 'Europe/London',
-        'UK': 'Europe/London',
-        'DE': 'Europe/Berlin',
-        'FR': 'Europe/Paris',
-        'IT': 'Europe/Rome',
-        'ES': 'Europe/Madrid',
-        'NL': 'Europe/Amsterdam',
-        'BE': 'Europe/Brussels',
-        'CH': 'Europe/Zurich',
-        'AT': 'Europe/Vienna',
-        'SE': 'Europe/Stockholm',
-        'NO': 'Europe/Oslo',
-        'DK': 'Europe/Copenhagen',
-        'FI': 'Europe/Helsinki',
-        'PL': 'Europe/Warsaw',
-        'CZ': 'Europe/Prague',
-        'RU': 'Europe/Moscow',
-        'JP': 'Asia/Tokyo',
-        'CN': 'Asia/Shanghai',
-        'KR': 'Asia/Seoul',
-        'SG': 'Asia/Singapore',
-        'HK': 'Asia/Hong_Kong',
-        'IN': 'Asia/Kolkata',
-        'TH': 'Asia/Bangkok',
-        'PH': 'Asia/Manila',
-        'ID': 'Asia/Jakarta',
-        'MY': 'Asia/Kuala_Lumpur',
-        'TW': 'Asia/Taipei',
-        'AU': 'Australia/Sydney',
-        'NZ': 'Pacific/Auckland',
-        'BR': 'America/Sao_Paulo',
-        'AR': 'America/Argentina/Buenos_Aires',
-        'CL': 'America/Santiago',
-        'MX': 'America/Mexico_City',
-        'ZA': 'Africa/Johannesburg',
-        'KE': 'Africa/Nairobi',
-        'EG': 'Africa/Cairo',
-        'NG': 'Africa/Lagos',
-        'AE': 'Asia/Dubai',
-        'SA': 'Asia/Riyadh',
-        'TR': 'Europe/Istanbul',
-        'IL': 'Asia/Jerusalem',
-    }
-    
-    # Hostname pattern to timezone mapping
-    HOSTNAME_PATTERNS = {
-        # US regions
-        'east': 'America/New_York',
-        'newyork': 'America/New_York',
-        'nyc': 'America/New_York',
-        'virginia': 'America/New_York',
-        'boston': 'America/New_York',
-        'miami': 'America/New_York',
-        'atlanta': 'America/New_York',
-        
-        'west': 'America/Los_Angeles',
-        'losangeles': 'America/Los_Angeles',
-        'california': 'America/Los_Angeles',
-        'sanfrancisco': 'America/Los_Angeles',
-        'seattle': 'America/Los_Angeles',
-        'portland': 'America/Los_Angeles',
-        
-        'central': 'America/Chicago',
-        'chicago': 'America/Chicago',
-        'dallas': 'America/Chicago',
-        'texas': 'America/Chicago',
-        
-        'mountain': 'America/Denver',
-        'denver': 'America/Denver',
-        'phoenix': 'America/Phoenix',
-        
-        # European cities
-        'london': 'Europe/London',
-        'paris': 'Europe/Paris',
-        'berlin': 'Europe/Berlin',
-        'frankfurt': 'Europe/Berlin',
-        'amsterdam': 'Europe/Amsterdam',
-        'madrid': 'Europe/Madrid',
-        'rome': 'Europe/Rome',
-        'stockholm': 'Europe/Stockholm',
-        'warsaw': 'Europe/Warsaw',
-        'moscow': 'Europe/Moscow',
-        
-        # Asian cities
-        'tokyo': 'Asia/Tokyo',
-        'singapore': 'Asia/Singapore',
-        'hongkong': 'Asia/Hong_Kong',
-        'shanghai': 'Asia/Shanghai',
-        'beijing': 'Asia/Shanghai',
-        'seoul': 'Asia/Seoul',
-        'mumbai': 'Asia/Kolkata',
-        'bangalore': 'Asia/Kolkata',
-        'dubai': 'Asia/Dubai',
-        'bangkok': 'Asia/Bangkok',
-        
-        # Australia
-        'sydney': 'Australia/Sydney',
-        'melbourne': 'Australia/Sydney',
-        'brisbane': 'Australia/Brisbane',
-        'perth': 'Australia/Perth',
-    }
+    # Shared module-level maps. Lookups read them through self, so a subclass
+    # may override them (HOSTNAME_PATTERNS is compiled when the instance is created)
+    CITY_TIMEZONE_MAP = CITY_TIMEZONE_MAP
+    COUNTRY_TIMEZONE_MAP = COUNTRY_TIMEZONE_MAP
+    HOSTNAME_PATTERNS = HOSTNAME_PATTERNS
     
     def __init__(self):
         """Initialize timezone manager"""
-        pass
+        # Only an overridden pattern map needs its own automaton
+        if _HOSTNAME_AUTOMATON is None or self.HOSTNAME_PATTERNS is HOSTNAME_PATTERNS:
+            self._hostname_automaton = _HOSTNAME_AUTOMATON
+        else:
+            self._hostname_automaton = _build_hostname_automaton(self.HOSTNAME_PATTERNS)
     
     def detect_timezone_from_ip(self, ip_address: str) -> Optional[str]:
         """
@@ -238,12 +300,12 @@ class TimezoneManager:
         if not ip_address:
             return None
         
-        logger.debug(f"🔍 Timezone detection for IP: {ip_address}")
+        logger.debug("🔍 Timezone detection for IP: %s", ip_address)
         
         # This is now mainly a fallback - IPResolver handles the main logic
         # Just return default for US proxies
-        logger.debug(f"   Using default US timezone")
-        return 'America/New_York'
+        logger.debug("   Using default US timezone")
+        return _DEFAULT_TZ
     
     def get_timezone_for_location(
         self,
@@ -262,17 +324,19 @@ class TimezoneManager:
         """
         # Try city first (most accurate)
         if city:
-            city_lower = city.lower().strip()
-            if city_lower in self.CITY_TIMEZONE_MAP:
-                logger.debug(f"   City match: {city_lower} → {self.CITY_TIMEZONE_MAP[city_lower]}")
-                return self.CITY_TIMEZONE_MAP[city_lower]
+            city_key = city.strip().lower()
+            timezone = self.CITY_TIMEZONE_MAP.get(city_key)
+            if timezone:
+                logger.debug("   City match: %s → %s", city_key, timezone)
+                return timezone
         
         # Fall back to country
         if country:
-            country_upper = country.upper().strip()
-            if country_upper in self.COUNTRY_TIMEZONE_MAP:
-                logger.debug(f"   Country match: {country_upper} → {self.COUNTRY_TIMEZONE_MAP[country_upper]}")
-                return self.COUNTRY_TIMEZONE_MAP[country_upper]
+            country_key = country.strip().upper()
+            timezone = self.COUNTRY_TIMEZONE_MAP.get(country_key)
+            if timezone:
+                logger.debug("   Country match: %s → %s", country_key, timezone)
+                return timezone
         
         return None
     
@@ -288,18 +352,26 @@ class TimezoneManager:
         """
         hostname_lower = '.'.join(hostname_parts).lower()
         
-        # Check each pattern
-        for pattern, timezone in self.HOSTNAME_PATTERNS.items():
-            if pattern in hostname_lower:
-                logger.debug(f"   Hostname pattern match: {pattern} → {timezone}")
+        if self._hostname_automaton is not None:
+            # Single pass finds every pattern; the earliest-listed one wins, as in the loop
+            match = min((payload for _, payload in self._hostname_automaton.iter(hostname_lower)), default=None)
+            if match:
+                _, pattern, timezone = match
+                logger.debug("   Hostname pattern match: %s → %s", pattern, timezone)
                 return timezone
+        else:
+            # Check each pattern
+            for pattern, timezone in self.HOSTNAME_PATTERNS.items():
+                if pattern in hostname_lower:
+                    logger.debug("   Hostname pattern match: %s → %s", pattern, timezone)
+                    return timezone
         
         # Check for country codes in hostname
         for part in hostname_parts:
             part_upper = part.upper()
-            if part_upper in self.COUNTRY_TIMEZONE_MAP:
-                timezone = self.COUNTRY_TIMEZONE_MAP[part_upper]
-                logger.debug(f"   Hostname country code: {part_upper} → {timezone}")
+            timezone = self.COUNTRY_TIMEZONE_MAP.get(part_upper)
+            if timezone:
+                logger.debug("   Hostname country code: %s → %s", part_upper, timezone)
                 return timezone
         
         return None
@@ -321,29 +393,70 @@ class TimezoneManager:
         Returns:
             Updated configuration with corrected timezone
         """
-        original_timezone = config.get('timezone', 'America/New_York')
-        
         # If force_timezone is provided, use it
         if force_timezone:
+            logger.info("🕐 Timezone forced: %s → %s", config.get('timezone', _DEFAULT_TZ), force_timezone)
             config['timezone'] = force_timezone
-            logger.info(f"🕐 Timezone forced: {original_timezone} → {force_timezone}")
             return config
         
         # If no proxy IP, keep original
         if not proxy_ip:
-            logger.debug(f"🕐 No proxy IP provided - keeping timezone: {original_timezone}")
+            logger.debug("🕐 No proxy IP provided - keeping timezone: %s", config.get('timezone', _DEFAULT_TZ))
             return config
         
+        original_timezone = config.get('timezone', _DEFAULT_TZ)
+        
         # Use fallback detection
         detected_timezone = self.detect_timezone_from_ip(proxy_ip)
         
         if detected_timezone:
             config['timezone'] = detected_timezone
             if detected_timezone != original_timezone:
-                logger.info(f"🕐 Timezone corrected: {original_timezone} → {detected_timezone}")
+                logger.info("🕐 Timezone corrected: %s → %s", original_timezone, detected_timezone)
         
         return config
     
+    def override_timezone_in_configs(
+        self,
+        configs: List[Dict[str, Any]],
+        proxy_ip: Optional[str] = None,
+        force_timezone: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Override timezone in several configurations sharing one proxy
+        
+        Detection runs once for the batch instead of once per config.
+        
+        Args:
+            configs: Mobile configuration dictionaries (updated in place)
+            proxy_ip: Proxy IP address (optional)
+            force_timezone: Force a specific timezone (overrides detection)
+        
+        Returns:
+            The same configurations with corrected timezones
+        """
+        if force_timezone:
+            timezone = force_timezone
+        elif proxy_ip:
+            timezone = self.detect_timezone_from_ip(proxy_ip)
+        else:
+            logger.debug("🕐 No proxy IP provided - keeping timezones for %d configs", len(configs))
+            return configs
+        
+        if not timezone:
+            return configs
+        
+        changed = 0
+        for config in configs:
+            if config.get('timezone', _DEFAULT_TZ) != timezone:
+                changed += 1
+            config['timezone'] = timezone
+        
+        if changed:
+            logger.info("🕐 Timezone set to %s (%d/%d configs changed)", timezone, changed, len(configs))
+        
+        return configs
+    
     def validate_timezone(self, timezone: str) -> bool:
         """
         Validate if timezone is a valid IANA timezone
@@ -354,10 +467,4 @@ class TimezoneManager:
         Returns:
             True if valid, False otherwise
         """
-        try:
-            import pytz
-            return timezone in pytz.all_timezones
-        except ImportError:
-            # Fallback: Check if it's in our known timezones
-            all_known = set(self.CITY_TIMEZONE_MAP.values()) | set(self.COUNTRY_TIMEZONE_MAP.values())
-            return timezone in all_known
+        return timezone in _valid_timezones()
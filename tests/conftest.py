@@ -0,0 +1,6 @@
+"""Make the src/ packages importable the way main.py does"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,83 @@
+"""Tests for IPResolver"""
+
+import asyncio
+
+from utils import ip_resolver
+from utils.ip_resolver import IPResolver, ResolvedProxy
+
+
+class _NoGeoIP:
+    def is_available(self):
+        return False
+
+
+def _make_resolver(monkeypatch):
+    monkeypatch.setattr(ip_resolver, 'get_geoip_manager', lambda auto_download=True: _NoGeoIP())
+    return IPResolver(cache_db_path=None)
+
+
+def test_force_refresh_does_not_join_a_normal_in_flight_lookup(monkeypatch):
+    resolver = _make_resolver(monkeypatch)
+    calls = []
+    
+    async def fake_resolve_uncached(proxy_host, start_time, force_refresh=False):
+        calls.append(force_refresh)
+        await asyncio.sleep(0.01)
+        timezone = 'Europe/Berlin' if force_refresh else 'America/New_York'
+        return ResolvedProxy(hostname=proxy_host, ip_address='203.0.113.7', timezone=timezone)
+    
+    monkeypatch.setattr(resolver, '_resolve_uncached', fake_resolve_uncached)
+    
+    async def run():
+        config = {'host': 'proxy.example.com'}
+        normal = asyncio.create_task(resolver.resolve_proxy(config))
+        await asyncio.sleep(0)
+        forced = await resolver.resolve_proxy(config, force_refresh=True)
+        return await normal, forced
+    
+    normal, forced = asyncio.run(run())
+    
+    assert sorted(calls) == [False, True]
+    assert normal.timezone == 'America/New_York'
+    assert forced.timezone == 'Europe/Berlin'
+    assert not resolver._in_flight
+
+
+def test_concurrent_lookups_of_one_host_share_a_task(monkeypatch):
+    resolver = _make_resolver(monkeypatch)
+    calls = []
+    
+    async def fake_resolve_uncached(proxy_host, start_time, force_refresh=False):
+        calls.append(force_refresh)
+        await asyncio.sleep(0.01)
+        return ResolvedProxy(hostname=proxy_host, ip_address='203.0.113.7', timezone='Europe/Berlin')
+    
+    monkeypatch.setattr(resolver, '_resolve_uncached', fake_resolve_uncached)
+    
+    async def run():
+        config = {'host': 'proxy.example.com'}
+        return await asyncio.gather(*(resolver.resolve_proxy(config) for _ in range(3)))
+    
+    results = asyncio.run(run())
+    
+    assert calls == [False]
+    assert all(result is results[0] for result in results)
+
+
+def test_aclose_closes_the_resolution_cache_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(ip_resolver, 'get_geoip_manager', lambda auto_download=True: _NoGeoIP())
+    resolver = IPResolver(cache_db_path=tmp_path / 'resolved.db')
+    resolved = ResolvedProxy(
+        hostname='proxy.example.com', ip_address='203.0.113.7',
+        timezone='Europe/Berlin', resolution_method='ip_api'
+    )
+    
+    async def run():
+        await resolver._persist([resolved])
+        await resolver.aclose()
+        # Persistence is skipped after close; lookups fall back to no rows
+        await resolver._persist([resolved])
+        return await resolver._load_persisted(['proxy.example.com'])
+    
+    assert asyncio.run(run()) == {}
+    assert resolver._db is None
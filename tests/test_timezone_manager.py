@@ -0,0 +1,32 @@
+"""Tests for TimezoneManager"""
+
+from utils.timezone_manager import TimezoneManager
+
+
+def test_city_keys_are_stored_normalized():
+    # get_timezone_for_location strips and lowercases the city, then does one .get()
+    for key in TimezoneManager.CITY_TIMEZONE_MAP:
+        assert key == key.strip().lower(), key
+
+
+def test_country_keys_are_stored_normalized():
+    # get_timezone_for_location strips and uppercases the country, then does one .get()
+    for key in TimezoneManager.COUNTRY_TIMEZONE_MAP:
+        assert key == key.strip().upper(), key
+
+
+def test_location_lookup_normalizes_input():
+    manager = TimezoneManager()
+    assert manager.get_timezone_for_location(city='  Dubai ') == 'Asia/Dubai'
+    assert manager.get_timezone_for_location(country=' de ') == 'Europe/Berlin'
+    assert manager.get_timezone_for_location(city='atlantis') is None
+
+
+def test_hostname_hints_follow_subclass_patterns():
+    class CustomManager(TimezoneManager):
+        HOSTNAME_PATTERNS = {'tokyo': 'Asia/Tokyo'}
+    
+    assert CustomManager().get_timezone_from_hostname_hints(['proxy', 'tokyo', 'de']) == 'Asia/Tokyo'
+    # 'east' is only in the default patterns; the country code still matches
+    assert CustomManager().get_timezone_from_hostname_hints(['us-east', 'de']) == 'Europe/Berlin'
+    assert TimezoneManager().get_timezone_from_hostname_hints(['us-east', 'de']) == 'America/New_York'